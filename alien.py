@@ -1,8 +1,10 @@
 import math
 import pygame
-import random
 from pygame.sprite import Sprite
-from images import Images
+from kinematics import Kinematics
+
+# Image of each type of alien
+ALIEN_IMAGES = {1: 'first_alien', 2: 'second_alien', 3: 'third_alien'}
 
 class Alien(Sprite):
     """A class to manage bullets fired from the ship"""
@@ -13,28 +15,28 @@ class Alien(Sprite):
         self.ai_game = ai_game
         self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.image_retrieve = Images()
+        self.image_retrieve = ai_game.image_retrieve
 
         # Load the alien image and set its rect attribute
-        if alien_type == 1:
-            self.image = self.image_retrieve.aliens['first_alien']
-        elif alien_type == 2:
-            self.image = self.image_retrieve.aliens['second_alien']
-        elif alien_type == 3:
-            self.image = self.image_retrieve.aliens['third_alien']
-
+        self.image = self.image_retrieve.aliens[ALIEN_IMAGES[alien_type]]
         self.rect = self.image.get_rect()
 
+        # Store the alien's exact position and velocity
+        self.kinematics = Kinematics()
+
         # Start each new alien at the top left
         self.spawn_aliens()
 
-        # Store the alien's exact horizontal position
-        self.x = float(self.rect.x)
+    def place(self, x_position, y_position):
+        """Move the alien to a position, keeping its exact position in step."""
+        self.rect.x = x_position
+        self.rect.y = y_position
+        self.kinematics.place(self.rect)
+        self.ai_game.forget_previous_position(self)
 
     def update(self, delta_time):
-        
-        self.rect.x += self.x_speed * delta_time
-        self.rect.y += self.y_speed * delta_time       
+        """Move the alien, the game moves them all at once with move_sprites."""
+        self.kinematics.move(self.rect, delta_time)
         
         # dir_x, dir_y = self.ai_game.ship.movement.x - self.rect.x, self.ai_game.ship.movement.y - self.rect.y
         # self.rotation = (180 / math.pi) * -math.atan2(-dir_x, -dir_y)
@@ -44,27 +46,31 @@ class Alien(Sprite):
 
     def spawn_aliens(self):
         """Spawn alien ships at random positions."""
-        self.direction = random.randrange(4)
+        rng = self.ai_game.rng.spawns
+        kinematics = self.kinematics
+        self.direction = rng.randrange(4)
         if self.direction == 0:
-            self.rect.x = random.randrange(self.settings.screen_width - self.rect.width)
-            self.rect.y = random.randrange(-20, -4)
-            self.x_speed = 0
-            self.y_speed = random.randrange(1, 8)
+            self.rect.x = rng.randrange(self.settings.screen_width - self.rect.width)
+            self.rect.y = rng.randrange(-20, -4)
+            kinematics.vx = 0
+            kinematics.vy = rng.randrange(1, 8)
         elif self.direction == 1:
-            self.rect.x = random.randrange(self.settings.screen_width - self.rect.width)
-            self.rect.y = random.randrange(self.settings.screen_height, self.settings.screen_height + 6)
-            self.x_speed = 0
-            self.y_speed = -random.randrange(1, 8)
+            self.rect.x = rng.randrange(self.settings.screen_width - self.rect.width)
+            self.rect.y = rng.randrange(self.settings.screen_height, self.settings.screen_height + 6)
+            kinematics.vx = 0
+            kinematics.vy = -rng.randrange(1, 8)
         elif self.direction == 2:
-            self.rect.x = random.randrange(-20, -4)
-            self.rect.y = random.randrange(self.settings.screen_height - self.rect.height)
-            self.x_speed = random.randrange(1, 8)
-            self.y_speed = 0
+            self.rect.x = rng.randrange(-20, -4)
+            self.rect.y = rng.randrange(self.settings.screen_height - self.rect.height)
+            kinematics.vx = rng.randrange(1, 8)
+            kinematics.vy = 0
         elif self.direction == 3:
-            self.rect.x = random.randrange(self.settings.screen_width, self.settings.screen_width + 6)
-            self.rect.y = random.randrange(self.settings.screen_height - self.rect.height)
-            self.x_speed = -random.randrange(1, 8)
-            self.y_speed = 0
+            self.rect.x = rng.randrange(self.settings.screen_width, self.settings.screen_width + 6)
+            self.rect.y = rng.randrange(self.settings.screen_height - self.rect.height)
+            kinematics.vx = -rng.randrange(1, 8)
+            kinematics.vy = 0
+        kinematics.place(self.rect)
+        self.ai_game.forget_previous_position(self)
 
     # def _create_alien(self, x_position, y_position, alien_type):
     #     """Create a new alien at the defined x and y positions."""
@@ -77,21 +83,16 @@ class Alien(Sprite):
 
 
     def check_edges(self):
-        """Return True if an alien ship has hit the edge of the screen."""
-
-        # Respawn the alien if it goes out of the screen
+        """Return True if an alien ship has left the screen on the side it flies towards."""
         if self.direction == 0:
-            if self.rect.top > self.settings.screen_height:
-                self.spawn_aliens()
+            return self.rect.top > self.settings.screen_height
         elif self.direction == 1:
-            if self.rect.bottom < -10:
-                self.spawn_aliens()
+            return self.rect.bottom < -10
         elif self.direction == 2:
-            if self.rect.left > self.settings.screen_width:
-                self.spawn_aliens()
+            return self.rect.left > self.settings.screen_width
         elif self.direction == 3:
-            if self.rect.right < -10:
-                self.spawn_alies()
+            return self.rect.right < -10
+        return False
 
 class BossAlien(Sprite):
     """A class to manage the boss alien"""
@@ -101,7 +102,7 @@ class BossAlien(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.image_retrieve = Images()
+        self.image_retrieve = ai_game.image_retrieve
 
         # Load the boss alien image and set its rect attribute
         self.image = self.image_retrieve.boss['boss']
@@ -111,14 +112,12 @@ class BossAlien(Sprite):
         self.rect.x = self.screen.get_rect().centerx - self.rect.width // 2
         self.rect.y = self.rect.height
 
-        # Store the boss alien's exact position
-        self.x = float(self.rect.x)
-        self.y = float(self.rect.y)
+        # Store the boss alien's exact position, it stays fixed at the top center
+        self.kinematics = Kinematics(self.rect.x, self.rect.y)
 
     def update(self, delta_time):
         """Keep the boss alien fixed at the top center."""
-        self.rect.x = self.screen.get_rect().centerx - self.rect.width // 2
-        self.rect.y = self.rect.height
+        self.kinematics.move(self.rect, delta_time)
 
     def check_edges(self):
         """Boss alien does not move, so it never hits the edges."""
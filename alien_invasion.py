@@ -1,27 +1,53 @@
+import os
 import sys
+import math
+import argparse
 import pygame
 import json
-import random
 from pathlib import Path
 from settings import Settings
 from ship import Ship
-from bullet import Bullet, AlienBullet
+from bullet import Bullet, AlienBullet, BulletPool
+from bullet_engine import BulletEngine
+from collisions import SpatialHash
+from kinematics import move_sprites
 from alien import BossAlien, Alien
-from time import sleep
+from alien_population import AlienPopulation
 from game_stats import GameStats
 from buttons import Button
 from scoreboard import Scoreboard
 from fleet_patterns import FleetStructure
 from sounds import SoundManager
-from images import Images
+from asset_bundle import AssetBundle, BUNDLE_PATH
+from asset_loader import AssetLoader
+from scenes import SceneManager, LoadingScene, MenuScene, GameScene, PauseScene
+from images import Images, IMAGES, DEFERRED_CATEGORIES
 from upgrades import Upgrade
+from input_script import InputScript
+from random_streams import RandomStreams
+from profiler import FrameProfiler
+from renderer import DirtyRectRenderer
+from timestep import FixedTimestep
+from scheduler import Scheduler
+from pacing import FramePacer
+from text import Fonts
 
 
 class AlienInvasion:
     """Overall class to manage game assets and behaviour"""
 
-    def __init__(self):
-        """Initialize the game, create game resources"""
+    def __init__(self, headless=False, seed=None):
+        """Initialize the game, create game resources.
+
+        A headless game uses dummy video and audio drivers, so it can run
+        simulations on a machine without a display or sound card. Games
+        created with the same seed play out the same way.
+        """
+        self.headless = headless
+        self.rng = RandomStreams(seed)
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         pygame.init()
 
         self.clock = pygame.time.Clock()
@@ -30,68 +56,212 @@ class AlienInvasion:
         self.screen = pygame.display.set_mode(
             (self.settings.screen_width, self.settings.screen_height))
         pygame.display.set_caption("Alien Invasion")
-
-        self.sound_manager = SoundManager()
-        self.image_retrieve = Images()
+        self.pacer = FramePacer(self.clock, self.settings.frame_rate,
+                                self.settings.minimized_frame_rate)
+        self.renderer = DirtyRectRenderer(self.screen, update_display=not headless)
+
+        # Load the prebuilt asset bundle, if there is one
+        self.asset_bundle = None
+        if self.settings.use_asset_bundle and Path(BUNDLE_PATH).exists():
+            self.asset_bundle = AssetBundle(BUNDLE_PATH)
+
+        self.sound_manager = SoundManager(bundle=self.asset_bundle)
+        self.image_retrieve = Images(  # Shared by every sprite
+            self.settings.use_sprite_atlas, self.asset_bundle)
+        self.fonts = Fonts()
+
+        # Decode the images on a worker thread while the loading screen shows
+        self.asset_loader = AssetLoader(self.image_retrieve, IMAGES)
+        self.asset_loader.start()
+        self._show_loading_scene(
+            [category for category in IMAGES if category not in DEFERRED_CATEGORIES])
 
         # Create an instance to store the stats  
         self.stats = GameStats(self)
         self.score = Scoreboard(self)
+        self.profiler = FrameProfiler(self)
 
         self.ship = Ship(self)
         self.bullets = pygame.sprite.Group()
         self.alien_bullets = pygame.sprite.Group()
+        self.use_bullet_engine = (self.settings.vectorized_bullets
+                                  and BulletEngine.is_available())
+        self.bullet_pool = BulletPool(
+            self, Bullet, self.settings.bullet_pool_size, self._make_bullet_engine())
+        self.alien_bullet_pool = BulletPool(
+            self, AlienBullet, self.settings.alien_bullet_pool_size,
+            self._make_bullet_engine())
         self.aliens = pygame.sprite.Group()
         self.upgrades = pygame.sprite.Group()
+        self.alien_population = AlienPopulation(self)
+        self.fleet = FleetStructure(self)
+        self.alien_grid = SpatialHash(self.settings.collision_cell_size)
         self.enemies_killed = 0
         self.upgrade_spawned = False
         self.bullet_type = 'bullet'
 
-        self.last_alien_spawn_time = pygame.time.get_ticks()
+        # Game time in milliseconds, advanced by every simulation step
+        self.game_time = 0
+        self.timestep = FixedTimestep(
+            self.settings.fixed_delta_time, self.settings.max_steps_per_frame)
+        self.previous_positions = {}  # Where sprites were before the last step
+        self.ship_hit_time_left = 0
+        self.frame = 0
+        self.input_script = None
+        self.render = True
+
+        # Spawns, upgrade drops and boss fights are timers on the game time
+        self.scheduler = Scheduler()
         self.alien_spawn_interval = self.settings.alien_spawn_interval
+        self.level_in_progress = False  # Set once an alien of the level spawned
+        self.boss_timer = None  # The boss fight that is due, the level waits for it
         
         self.play_button = Button(self, "PLAY")
         self._make_difficulty_buttons()
+        self.buttons = (self.play_button, self.easy_button,
+                        self.medium_button, self.hard_button)
 
         # Start the game on active state
         self.game_active = False  
 
         self.boss = None
 
+        # Only the scene on top of the stack is updated and drawn
+        self.menu_scene = MenuScene(self)
+        self.game_scene = GameScene(self)
+        self.pause_scene = PauseScene(self)
+        self.scenes = SceneManager()
+        self.scenes.push(self.menu_scene)
+
     def run_game(self):
         """Start the main game loop."""
         while True:
-            # Check events
-            self._check_events()
-
             # Calculate delta time
             delta_time = self.clock.get_time() / 100  # Time in seconds
 
-            if self.game_active:
-                self.ship.update_position(delta_time) 
-                self.ship.update_rotation()
-                self._update_bullets(delta_time)
-                self._update_aliens(delta_time)
+            self._run_frame(delta_time)
 
-            # Redraw screen
-            self._update_screen()
+            # Wait for the next frame, sleeping while the scene is idle
+            self.pacer.tick(self.scenes.active)
 
-            # Limit frame rate
-            self.clock.tick(120)
+    def run_simulation(self, frames, input_script=None, render=False, new_game=True):
+        """Play a game for a number of frames as fast as possible.
+
+        Each frame runs one simulation step of `settings.fixed_delta_time`
+        and input comes from the InputScript instead of the keyboard and
+        mouse. The run stops early if the game is over. Pass new_game=False
+        to continue a game that was already started. Returns the stats.
+        """
+        self.input_script = input_script or InputScript()
+        self.render = render
+        if new_game:
+            self._start_game()
 
-    def _check_events(self):
+        for self.frame in range(frames):
+            self._run_frame(self.settings.fixed_delta_time)
+            if not self.game_active:
+                break
+
+        return self.stats
+
+    def _show_loading_scene(self, categories):
+        """Show the loading scene until the given categories of images are ready."""
+        loading_scene = LoadingScene(self.settings, self.asset_loader)
+        while not self.asset_loader.is_loaded(*categories):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    sys.exit()
+
+            loading_scene.update(0)
+            loading_scene.render(self.screen)
+            if not self.headless:
+                pygame.display.flip()
+
+    def _run_frame(self, delta_time):
+        """Run the active scene for one frame."""
+        # Convert the images decoded in the background since the last frame
+        self.asset_loader.poll()
+
+        # Let every sound effect play once more this frame
+        self.sound_manager.start_frame()
+
+        # Check events, they may change the active scene
+        with self.profiler.phase('events'):
+            self.scenes.handle_events(self._get_events())
+
+        self.scenes.update(delta_time)
+
+        # Redraw screen, with the scene the update may have moved to
+        scene = self.scenes.active
+        if self.render:
+            with self.profiler.phase('update_screen'):
+                scene.render(self.screen)
+
+        self.profiler.end_frame(scene.name)
+
+    def _update_game(self, delta_time):
+        """Run the simulation steps that fit in a frame, run by the game scene."""
+        for _ in range(self.timestep.advance(delta_time)):
+            self._step_game(self.timestep.step)
+            if self.scenes.active is not self.game_scene:
+                break  # The game ended, or the step moved to another scene
+
+    def _step_game(self, delta_time):
+        """Advance the game by one fixed simulation step."""
+        # Remember where the sprites were, to draw them between the two steps
+        self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.aliens}
+        self.previous_positions[self.ship] = self.ship.rect.center  # Its image changes size
+        if not self.use_bullet_engine:
+            for bullet in self.bullets:
+                self.previous_positions[bullet] = bullet.rect.topleft
+            for bullet in self.alien_bullets:
+                self.previous_positions[bullet] = bullet.rect.topleft
+
+        # Hold the game still for a moment after the ship was hit
+        if self.ship_hit_time_left > 0:
+            self.ship_hit_time_left -= delta_time * 100
+            if self.use_bullet_engine:
+                self.bullet_pool.engine.hold()
+                self.alien_bullet_pool.engine.hold()
+            return
+
+        self.game_time += delta_time * 100
+        self.scheduler.advance(self.game_time)
+
+        with self.profiler.phase('update_position'):
+            self.ship.update_position(delta_time) 
+        with self.profiler.phase('update_rotation'):
+            self.ship.update_rotation(self._get_mouse_pos())
+        with self.profiler.phase('update_bullets'):
+            self._update_bullets(delta_time)
+        with self.profiler.phase('update_aliens'):
+            self._update_aliens(delta_time)
+
+    def _get_events(self):
+        """Return the events of this frame, with those of the input script."""
+        events = self.pacer.get_events()
+        if self.input_script:
+            events += self.input_script.events_for(self.frame)
+        return events
+
+    def _check_events(self, events):
         """Check for events or letters typed."""
-        for event in pygame.event.get():
+        for event in events:
 
             if event.type == pygame.QUIT:
                 self._close_game()
 
+            # Pause the game when the player switches away from it
+            if (event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED)
+                    and self.game_active):
+                self._pause()
+
             if event.type == pygame.KEYDOWN:
                 self._check_keydown_events(event)
             elif event.type == pygame.KEYUP:
                 self._check_keyup_events(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = self._get_mouse_pos()
                 self._check_play_button(mouse_pos)
                 self._check_difficulty_buttons(mouse_pos)
 
@@ -115,6 +285,14 @@ class AlienInvasion:
             self._play_noise('laserShoot')
             self._fire_bullet()
 
+        # Pause the game with Escape
+        if event.key == pygame.K_ESCAPE and self.game_active:
+            self._pause()
+
+        # Show or hide the frame time overlay
+        if event.key == pygame.K_F3:
+            self.settings.show_profiler = not self.settings.show_profiler
+
         # QUIT THE GAME
         if event.key == pygame.K_q:
             self._close_game()
@@ -129,16 +307,38 @@ class AlienInvasion:
         elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
             self.ship.movement.moving_down = False
 
+    def _pause(self):
+        """Show the pause screen over the game, unless it is already paused."""
+        if self.scenes.active is not self.pause_scene:
+            self.scenes.push(self.pause_scene)
+
     def _spawn_alien(self):
-        """Spawn a single alien at a random location."""
+        """Spawn a single alien at a random location, if there is room for one."""
+        if not self.alien_population.has_room():
+            return
+
         alien_type = self.stats.level % 3 + 1 
-        x_position = random.randint(0, self.settings.screen_width - 50)  # Keep aliens on-screen
-        y_position = random.randint(-100, -40)  # Spawn just above the screen
+        x_position = self.rng.spawns.randint(0, self.settings.screen_width - 50)  # Keep aliens on-screen
+        y_position = self.rng.spawns.randint(-100, -40)  # Spawn just above the screen
 
         new_alien = Alien(self, alien_type)
-        new_alien.rect.x = x_position
-        new_alien.rect.y = y_position
-        self.aliens.add(new_alien)
+        new_alien.place(x_position, y_position)
+        self.alien_population.add(new_alien)
+        self.level_in_progress = True
+
+    def _create_fleet(self):
+        """Create the fleet of the current level, boss levels have the boss instead."""
+        if self.stats.level % 5 == 0 and self.stats.level != 0:
+            self._schedule_boss_fight()
+            return
+        self.fleet.create_fleet(self.stats.level % 3 + 1)
+        if self.aliens:
+            self.level_in_progress = True
+
+    def _spawn_next_alien(self):
+        """Spawn an alien, and the next one after the spawn interval."""
+        self._spawn_alien()
+        self.scheduler.call_later(self.alien_spawn_interval, self._spawn_next_alien)
 
     # def _check_fleet_edges(self, delta_time):
     #     """If any alien ship hits the edge, change behavior."""
@@ -154,39 +354,72 @@ class AlienInvasion:
     #     self.settings.fleet_direction *= -1
 
     def _update_screen(self):
-        """Update the images on the screen, and flip to the new screen"""
-        self.screen.blit(self.image_retrieve.backgrounds['first_background'], (0, 0))  # Draw the background image
-
-        self.ship.blitme()
-        self.draw_mouse_indicator(self.screen)
-        self.aliens.draw(self.screen)
-        self.upgrades.draw(self.screen)
+        """Update the images on the screen, and push the changed parts to the display.
+
+        Moving sprites are drawn between where they were on the last two
+        simulation steps, by how far the frame is into the next step.
+        """
+        renderer = self.renderer
+        alpha = self.timestep.alpha
+        if not self.settings.dirty_rect_rendering:
+            renderer.invalidate()
+
+        # Draw the background image over the previous frame
+        renderer.begin_frame(
+            self.image_retrieve.background('first_background', self.screen.get_size()))
+
+        ship_center = self._interpolate(self.ship, alpha, self.ship.rect.center)
+        renderer.add(self.ship.blitme(self.ship.image.get_rect(center=ship_center)))
+        renderer.add(self.draw_mouse_indicator(self.screen))
+        renderer.add_all(self.screen.blits(
+            [(alien.image, self._interpolate(alien, alpha)) for alien in self.aliens],
+            doreturn=True))
+        renderer.add_all(self.screen.blits(
+            [(upgrade.image, upgrade.rect) for upgrade in self.upgrades], doreturn=True))
+
+        for pool, group in ((self.bullet_pool, self.bullets),
+                            (self.alien_bullet_pool, self.alien_bullets)):
+            if self.use_bullet_engine:
+                xs, ys = pool.engine.interpolate(alpha)
+                for bullet in group.sprites():
+                    slot = bullet.engine_slot
+                    renderer.add(bullet.draw_bullet((xs[slot], ys[slot])))
+            else:
+                for bullet in group.sprites():
+                    renderer.add(bullet.draw_bullet(self._interpolate(bullet, alpha)))
 
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
+        renderer.add_all(self.score.show_score())
+        if self.settings.show_profiler:
+            renderer.add_all(self.profiler.show_overlay())
 
-        for alien_bullet in self.alien_bullets.sprites():
-            alien_bullet.draw_bullet()
+        renderer.end_frame()
 
-        self.score.show_score()
+    def forget_previous_position(self, sprite):
+        """Draw a sprite that jumped to a new spot there, instead of between the two spots."""
+        self.previous_positions.pop(sprite, None)
 
-        if not self.game_active:
-            self.play_button.draw_button()
-            self.easy_button.draw_button()
-            self.medium_button.draw_button()
-            self.hard_button.draw_button()
+    def _interpolate(self, sprite, alpha, current=None):
+        """Return where to draw a sprite, `alpha` of the way from its previous position.
 
-        pygame.display.flip()
+        The position is the top left of the rect, unless another `current`
+        point of it was recorded as the previous position.
+        """
+        x, y = sprite.rect.topleft if current is None else current
+        previous = self.previous_positions.get(sprite)
+        if previous is None:
+            return x, y
+        return (previous[0] + (x - previous[0]) * alpha,
+                previous[1] + (y - previous[1]) * alpha)
 
     def _fire_bullet(self):
         """Create a new bullet and add it to the bullets group."""
         # Get the mouse position 
-        pos = pygame.mouse.get_pos()
+        pos = self._get_mouse_pos()
 
         mouse_x = pos[0]
         mouse_y = pos[1]
 
-        new_bullet = Bullet(self, mouse_x, mouse_y, self.bullet_type)
+        new_bullet = self.bullet_pool.acquire(mouse_x, mouse_y, self.bullet_type)
         self.bullets.add(new_bullet)
 
         # Reset bullet_type
@@ -196,108 +429,182 @@ class AlienInvasion:
         
     def _update_bullets(self, delta_time):
         """Update position of bullets and get rid of old bullets."""
-        self.bullets.update(delta_time)
-        self.alien_bullets.update(delta_time)
+        if self.use_bullet_engine:
+            self._update_bullets_vectorized(delta_time)
+        else:
+            self._update_bullets_sprites(delta_time)
+
+        self._check_bullet_alien_collision(delta_time)
+
+    def _update_bullets_vectorized(self, delta_time):
+        """Move and cull all bullets with the NumPy bullet engines."""
+        for pool in (self.bullet_pool, self.alien_bullet_pool):
+            for bullet in pool.engine.update(delta_time):
+                pool.release(bullet)
 
-        # Get rid of bullets outside windows
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
+    def _update_bullets_sprites(self, delta_time):
+        """Move and cull all bullets one sprite at a time."""
+        move_sprites(self.bullets, delta_time)
+        move_sprites(self.alien_bullets, delta_time)
+
+        # Get rid of bullets outside windows, they can be fired in any direction
+        screen_rect = self.screen.get_rect()
+        for bullet in self.bullets.sprites():
+            if not screen_rect.colliderect(bullet.rect):
+                self.bullet_pool.release(bullet)
 
         # Get rid of alien bullets outside windows
-        for alien_bullet in self.alien_bullets.copy():
+        for alien_bullet in self.alien_bullets.sprites():
             if alien_bullet.rect.top >= self.settings.screen_height:
-                self.alien_bullets.remove(alien_bullet)
-
-        self._check_bullet_alien_collision()
+                self.alien_bullet_pool.release(alien_bullet)
         
+    def _make_bullet_engine(self):
+        """Return a vectorized bullet engine, or None if it is not in use."""
+        if self.use_bullet_engine:
+            return BulletEngine(self.screen.get_rect())
+        return None
+
     def _play_noise(self, selection:str):
         """Select a sound to be made when an event happens."""
         self.sound_manager.play_sound_effect(selection)
         
-    def _check_bullet_alien_collision(self):
+    def _check_bullet_alien_collision(self, delta_time):
         """Respond to bullet-alien collisions."""
-        self._handle_collisions()
+        self._handle_collisions(delta_time)
         self._check_if_level_finished()
-        self._check_if_boss_fight_should_start()
 
-    def _handle_collisions(self):
-        """Handle collisions between bullets and aliens."""
-        # If bullets hit the alien do collision
-        player_bullets_collision = pygame.sprite.groupcollide(
-                self.bullets, self.aliens, False, True # True means it will remove the sprite from the group
-            )
+    def _handle_collisions(self, delta_time):
+        """Handle collisions between bullets and aliens.
 
-        alien_player_collision = pygame.sprite.spritecollide(
-            self.ship, self.alien_bullets, True, False
-            )
+        Bullets are swept from where they were before the step, so fast
+        bullets can't jump over an alien or the ship between two steps.
+        """
+        # If bullets hit the alien do collision, only testing the aliens
+        # that share a grid cell with the path of the bullet
+        self.alien_grid.rebuild(self.aliens)
+        player_bullets_collision = {}
+        for bullet in self.bullets.sprites():
+            previous_rect = self._previous_rect(bullet, self.bullet_pool)
+            aliens_hit = [alien for alien in self.alien_grid.sweep(bullet.rect, previous_rect)
+                          if self._masks_collide(bullet, alien, previous_rect)]
+            if aliens_hit:
+                player_bullets_collision[bullet] = aliens_hit
+                for alien in aliens_hit:
+                    alien.kill()
+
+        # Alien bullets only fall, so one that passed through the ship this
+        # step now overlaps the ship's rect stretched down by a step
+        swept_ship_rect = self.ship.rect.inflate(0, self.settings.alien_bullet_speed * delta_time)
+        swept_ship_rect.top = self.ship.rect.top
+        alien_player_collision = [
+            alien_bullet for alien_bullet in self.alien_bullets
+            if swept_ship_rect.colliderect(alien_bullet.rect)
+            and self._masks_collide(alien_bullet, self.ship,
+                                    self._previous_rect(alien_bullet, self.alien_bullet_pool))]
+        for alien_bullet in alien_player_collision:
+            self.alien_bullet_pool.release(alien_bullet)
 
         if player_bullets_collision or alien_player_collision:
             self._play_noise('damageSound')
-            for aliens in player_bullets_collision.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
+            aliens_killed = sum(len(aliens) for aliens in player_bullets_collision.values())
+            self.stats.score += self.settings.alien_points * aliens_killed
             self.score.prep_score()
             self.score.check_high_score()
-            self.enemies_killed += len(aliens)
+            self.enemies_killed += aliens_killed
             if self.enemies_killed >= 25 and not self.upgrade_spawned:
                 self._create_upgrade() 
                 self.enemies_killed = 0
 
+    def _previous_rect(self, bullet, pool):
+        """Return the rect of a bullet before the last step."""
+        if self.use_bullet_engine:
+            x, y = pool.engine.previous_positions[bullet.engine_slot]
+        else:
+            x, y = self.previous_positions.get(bullet, bullet.rect.topleft)
+        return pygame.Rect(round(x), round(y), bullet.rect.width, bullet.rect.height)
+
+    def _masks_collide(self, sprite, other, previous_rect=None):
+        """Return True if two sprites whose rects touch also touch by their opaque pixels.
+
+        Given the rect the sprite moved from, its opaque pixels are checked
+        at points along the way, no further apart than the sprite is big.
+        """
+        if not self.settings.mask_collisions:
+            return True
+
+        rect = sprite.rect
+        if previous_rect is None:
+            previous_rect = rect
+        dx = rect.x - previous_rect.x
+        dy = rect.y - previous_rect.y
+        samples = math.ceil(max(abs(dx), abs(dy)) / max(1, min(rect.size)))
+
+        masks = self.image_retrieve.masks
+        for sample in range(samples, -1, -1):
+            fraction = sample / samples if samples else 1
+            position = previous_rect.move(round(dx * fraction), round(dy * fraction))
+            if masks.overlap(sprite.image, position, other.image, other.rect):
+                return True
+        return False
+
     def _check_if_level_finished(self):
-        """Check if all aliens have been destroyed."""
-        if not self.aliens:
-            self.bullets.empty()
+        """Check if all aliens of the level have been destroyed."""
+        if self.level_in_progress and not self.aliens and self.boss_timer is None:
+            self.level_in_progress = False
+            self.bullet_pool.release_all(self.bullets)
             self.stats.level += 1
-            # self._create_fleet()
+            if self.stats.level % 5 == 4:
+                # Make sure the boss is loaded for the next level
+                self.asset_loader.request('BOSS')
+            self._create_fleet()
             self.settings.increase_speed()
 
-        # Reduce spawn interval to increase difficulty
-        self.alien_spawn_interval = max(500, self.alien_spawn_interval - 200)  # Minimum of 500 ms
-
-    def _check_if_boss_fight_should_start(self):
-        """Check if it is time for a boss fight to start."""
-        if self.stats.level % 5 == 0 and self.stats.level != 0:
-            self._start_boss_fight()
+            # Reduce spawn interval to increase difficulty
+            self.alien_spawn_interval = max(500, self.alien_spawn_interval - 200)  # Minimum of 500 ms
 
 
     def _create_upgrade(self):
         """Create an upgrade at a random location."""
-        upgrade_type = random.choice(['missile','laser','shooting_speed', 'ship_speed', 'ship_shield'])  
-        location = (random.randint(0, self.settings.screen_width), 
-                    random.randint(0, self.settings.screen_height))
+        upgrade_type = self.rng.upgrades.choice(['missile','laser','shooting_speed', 'ship_speed', 'ship_shield'])  
+        location = (self.rng.upgrades.randint(0, self.settings.screen_width), 
+                    self.rng.upgrades.randint(0, self.settings.screen_height))
         upgrade = Upgrade(upgrade_type, location, self.image_retrieve)
         self.upgrades.add(upgrade)
         self.upgrade_spawned = True
+        self.scheduler.call_later(self.settings.upgrade_lifetime, self._expire_upgrade, upgrade)
         print(f"Created upgrade: {upgrade_type} at {location}")
 
-    def _update_aliens(self, delta_time):
-        """Update the alien positions and spawn new aliens."""
-        current_time = pygame.time.get_ticks()
-
-        # Spawn a new alien at regular intervals
-        if current_time - self.last_alien_spawn_time > self.alien_spawn_interval:
-            self._spawn_alien()
-            self.last_alien_spawn_time = current_time
+    def _expire_upgrade(self, upgrade):
+        """Remove an upgrade nobody picked up, so another one can drop."""
+        if upgrade.alive():
+            upgrade.kill()
+            self.upgrade_spawned = False
 
-        # Update existing aliens
-        self.aliens.update(delta_time)
+    def _update_aliens(self, delta_time):
+        """Update the alien positions, new aliens are spawned by the scheduler."""
+        # Update existing aliens, bringing back those that left the screen
+        move_sprites(self.aliens, delta_time)
+        self.alien_population.update()
 
         self._alien_shoot()
 
         # Check for collisions
         self._check_alien_collision()
+        self._check_upgrade_collision()
 
     def _alien_shoot(self):
         """Handle the bullets shot by the alien ships."""
         for alien in self.aliens:
-            if random.random() < 0.01:
-                new_bullet = AlienBullet(alien, self)
+            if self.rng.shooting.random() < 0.01:
+                new_bullet = self.alien_bullet_pool.acquire(alien)
                 self.alien_bullets.add(new_bullet)
         
     def _check_alien_collision(self): 
         """Check alien ship collisions with our ship."""
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
-            self._ship_hit()
+        for alien in pygame.sprite.spritecollide(self.ship, self.aliens, False):
+            if self._masks_collide(self.ship, alien):
+                self._ship_hit()
+                break
 
         # collisions = pygame.sprite.groupcollide(self.aliens, self.bullets, True, True)
 
@@ -319,21 +626,25 @@ class AlienInvasion:
         if self.settings.shield_strength > 0:
             self.settings.shield_strength -= 1
             self.ship.center_ship()
+            self.forget_previous_position(self.ship)
         else:
             if self.stats.ships_remaining > 0:
                 self.stats.ships_remaining -= 1
 
-                # Get rid of remaining bullets and aliens
-                self.bullets.empty()
-                self.aliens.empty()
+                # Get rid of remaining bullets and aliens, the level starts over
+                self.bullet_pool.release_all(self.bullets)
+                self.alien_population.clear()
+                self.level_in_progress = False
 
                 # Create a new fleet and center the ship
-                # self._create_fleet()
+                self._create_fleet()
                 self.ship.center_ship()
-                sleep(0.5)
+                self.forget_previous_position(self.ship)
+                self.ship_hit_time_left = self.settings.ship_hit_pause
             else:
                 self.game_active = False
                 pygame.mouse.set_visible(True)
+                self.scenes.transition(self.menu_scene)
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play."""
@@ -395,24 +706,45 @@ class AlienInvasion:
         self.score.prep_score()
         self.game_active = True
 
-        self.bullets.empty()
-        self.aliens.empty()
+        self.bullet_pool.release_all(self.bullets)
+        self.alien_bullet_pool.release_all(self.alien_bullets)
+        self.alien_population.clear()
+        self.alien_population.reset()
+        self.upgrades.empty()
+        self.upgrade_spawned = False
+        self.previous_positions = {}
+        self.ship_hit_time_left = 0
 
-        # self._create_fleet()
+        # Start the timers over, the first alien comes after a spawn interval
+        self.level_in_progress = False
+        self.boss_timer = None
+        self.alien_spawn_interval = self.settings.alien_spawn_interval
+        self.scheduler.clear(self.game_time)
+        self.scheduler.call_later(self.alien_spawn_interval, self._spawn_next_alien)
+
+        self._create_fleet()
         self.ship.center_ship()
 
         pygame.mouse.set_visible(False)
+        self.scenes.transition(self.game_scene)
 
     def draw_mouse_indicator(self, screen):
-        """Draw a custom indicator at the mouse position."""
-        mouse_pos = pygame.mouse.get_pos()
-        pygame.draw.circle(screen, (255, 0, 0), mouse_pos, 5)  # Red dot
-        pygame.draw.line(screen, (255, 0, 0), (mouse_pos[0] - 10, mouse_pos[1]), 
+        """Draw a custom indicator at the mouse position, return the rect it covers."""
+        mouse_pos = self._get_mouse_pos()
+        dot = pygame.draw.circle(screen, (255, 0, 0), mouse_pos, 5)  # Red dot
+        horizontal = pygame.draw.line(screen, (255, 0, 0), (mouse_pos[0] - 10, mouse_pos[1]), 
                         (mouse_pos[0] + 10, mouse_pos[1]), 2)  # Horizontal line
-        pygame.draw.line(screen, (255, 0, 0), (mouse_pos[0], mouse_pos[1] - 10), 
+        vertical = pygame.draw.line(screen, (255, 0, 0), (mouse_pos[0], mouse_pos[1] - 10), 
                         (mouse_pos[0], mouse_pos[1] + 10), 2)  # Vertical line
+        return dot.unionall([horizontal, vertical])
 
 
+    def _get_mouse_pos(self):
+        """Return the mouse position, from the input script if there is one."""
+        if self.input_script:
+            return self.input_script.mouse_pos
+        return pygame.mouse.get_pos()
+
     def _close_game(self):
         """Saves highest score and exit the game."""
         saved_high_score = self.stats.get_saved_high_score()
@@ -421,16 +753,53 @@ class AlienInvasion:
             contents = json.dumps(self.stats.high_score)
             path.write_text(contents)
 
+        self.profiler.stop_trace()
+        print(f"Frame pacing: {self.pacer.report()}")
 
         sys.exit()
 
+    def _schedule_boss_fight(self):
+        """Start the boss fight after a delay, instead of any that is already due."""
+        if self.boss_timer is not None:
+            self.scheduler.cancel(self.boss_timer)
+        self.boss_timer = self.scheduler.call_later(self.settings.boss_fight_delay,
+                                                    self._start_boss_fight)
+
     def _start_boss_fight(self):
         """Start the boss fight."""
+        self.boss_timer = None
         self.boss = BossAlien(self)
         self.aliens.add(self.boss)
+        self.level_in_progress = True
 
 
 if __name__ == '__main__':
-    # Make a game instance, and run the game
-    ai = AlienInvasion()
-    ai.run_game()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument('--headless', type=int, metavar='FRAMES',
+                        help="simulate a game for FRAMES frames without a display")
+    parser.add_argument('--seed', type=int,
+                        help="seed the random numbers, to replay the same game")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="write the time spent in each phase of every frame to a CSV file")
+    parser.add_argument('--profile', action='store_true',
+                        help="show the frame time overlay")
+    args = parser.parse_args()
+
+    if args.headless:
+        # Simulate a game and report how it went
+        ai = AlienInvasion(headless=True, seed=args.seed)
+        if args.trace:
+            ai.profiler.start_trace(args.trace)
+        stats = ai.run_simulation(args.headless)
+        ai.profiler.stop_trace()
+        print(f"Frames: {ai.frame + 1}, score: {stats.score}, level: {stats.level}, "
+              f"ships remaining: {stats.ships_remaining}")
+        print("Aliens: " + ", ".join(
+            f"{name} {count}" for name, count in ai.alien_population.counts().items()))
+    else:
+        # Make a game instance, and run the game
+        ai = AlienInvasion(seed=args.seed)
+        ai.settings.show_profiler = args.profile
+        if args.trace:
+            ai.profiler.start_trace(args.trace)
+        ai.run_game()
@@ -0,0 +1,72 @@
+import pygame
+
+
+class AlienPopulation:
+    """Keep the aliens on the screen and their number within a budget.
+
+    Aliens that fly off the far side of the screen are sent back in from a
+    new edge by `Alien.spawn_aliens`, or dropped if recycling is off, so the
+    group never fills up with aliens nobody can see. No more than
+    `settings.max_aliens` aliens are alive, fleets are cut short to fit, and
+    single spawns are refused once `settings.max_spawned_aliens` of them
+    are alive, however big the fleet is.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the population of the game's aliens group."""
+        self.settings = ai_game.settings
+        self.aliens = ai_game.aliens
+        self.spawns = pygame.sprite.Group()  # The aliens that spawned one at a time
+        self.reset()
+
+    def clear(self):
+        """Remove every alien from the game."""
+        self.aliens.empty()
+        self.spawns.empty()
+
+    def reset(self):
+        """Start counting again, for a new game."""
+        self.spawned = 0
+        self.recycled = 0
+        self.culled = 0
+
+    @property
+    def live(self):
+        """The number of aliens alive."""
+        return len(self.aliens)
+
+    def room(self):
+        """Return how many more aliens can be alive."""
+        return max(0, self.settings.max_aliens - len(self.aliens))
+
+    def has_room(self):
+        """Return True if another alien can spawn."""
+        return self.room() > 0 and len(self.spawns) < self.settings.max_spawned_aliens
+
+    def add(self, alien):
+        """Add a new alien to the game, the caller checks `has_room` first."""
+        self.aliens.add(alien)
+        self.spawns.add(alien)
+        self.spawned += 1
+
+    def add_fleet(self, aliens):
+        """Add a whole fleet at once, without the aliens that don't fit in `room`."""
+        aliens = aliens[:self.room()]
+        self.aliens.add(*aliens)
+        self.spawned += len(aliens)
+
+    def update(self):
+        """Recycle or cull every alien that left the screen."""
+        for alien in self.aliens.sprites():
+            if alien.check_edges():
+                if self.settings.recycle_aliens:
+                    alien.spawn_aliens()
+                    self.recycled += 1
+                else:
+                    alien.kill()
+                    self.culled += 1
+
+    def counts(self):
+        """Return the live, spawned, recycled and culled counts by name."""
+        return {'live': self.live, 'spawned': self.spawned,
+                'recycled': self.recycled, 'culled': self.culled}
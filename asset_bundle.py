@@ -0,0 +1,152 @@
+"""A single file holding every image and sound of the game, already decoded.
+
+Images are stored as raw RGB/RGBA pixels and sounds as PCM samples in the
+mixer's format, after a header indexing where each one starts. Loading the
+bundle memory-maps the file and builds surfaces and sounds straight from it,
+with no PNG, JPG or WAV decoding. The header also records the size and
+modification time of every source file, and assets whose file changed since
+are left out, so they are loaded from the file instead. Build it again
+whenever an asset changes:
+
+    python asset_bundle.py
+"""
+import os
+import json
+import mmap
+import struct
+import argparse
+import pygame
+from pathlib import Path
+from images import IMAGES, OPAQUE_CATEGORIES
+
+BUNDLE_PATH = 'assets.bundle'
+MAGIC = b'AIBUNDL1'
+ALIGNMENT = 16  # Every asset starts on a multiple of this many bytes
+
+
+class AssetBundle:
+    """Read images and sounds out of a memory-mapped asset bundle."""
+
+    def __init__(self, path=BUNDLE_PATH):
+        """Map the bundle file and read its header."""
+        with open(path, 'rb') as bundle_file:
+            self.data = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.view = memoryview(self.data)  # Slices of it share the mapped memory
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+        header_length, = struct.unpack_from('<I', self.data, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self.data[header_start:header_start + header_length])
+
+        # Offsets in the header count from the aligned end of the header
+        self.data_start = header_start + header_length
+        self.data_start += -self.data_start % ALIGNMENT
+
+        # Leave out the assets whose source file changed since the bundle was built
+        self.images = {path: entry for path, entry in header['images'].items()
+                       if is_current(path, entry)}
+        self.sounds = header['sounds']
+        if not all(is_current(entry.get('path'), entry) for entry in self.sounds.values()):
+            self.sounds = {}  # Sounds are loaded all from the bundle or all from the files
+        self.mixer_format = tuple(header['mixer_format'])
+
+    def has_image(self, path):
+        """Return True if the image file is in the bundle."""
+        return path in self.images
+
+    def decode_image(self, path):
+        """Return the surface of an image file, still to be converted for the display."""
+        entry = self.images[path]
+        length = entry['width'] * entry['height'] * len(entry['format'])
+        start = self.data_start + entry['offset']
+        pixels = self.view[start:start + length]
+        return pygame.image.frombuffer(pixels, (entry['width'], entry['height']), entry['format'])
+
+    def has_sounds(self):
+        """Return True if the bundled sounds match the running mixer."""
+        return bool(self.sounds) and pygame.mixer.get_init() == self.mixer_format
+
+    def load_sounds(self):
+        """Return every bundled sound effect by name."""
+        sounds = {}
+        for name, entry in self.sounds.items():
+            start = self.data_start + entry['offset']
+            samples = self.view[start:start + entry['length']]
+            sounds[name] = pygame.mixer.Sound(buffer=samples)
+        return sounds
+
+
+def source_stamp(path):
+    """Return the size and modification time of a source file."""
+    stat = Path(path).stat()
+    return {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+
+def is_current(path, entry):
+    """Return True if the source file of a bundle entry is unchanged since it was bundled."""
+    try:
+        stamp = source_stamp(path)
+    except (OSError, TypeError):
+        return False
+    return entry.get('size') == stamp['size'] and entry.get('mtime') == stamp['mtime']
+
+
+def build_bundle(path, sounds_dir='sounds'):
+    """Decode every image in IMAGES and every sound and write them to a bundle."""
+    # Offsets count from the start of the data, right after the header
+    header = {'images': {}, 'sounds': {}}
+    blobs = []
+    offset = 0
+
+    def add_blob(blob):
+        """Queue a blob of data and return its offset."""
+        nonlocal offset
+        start = offset
+        padding = -len(blob) % ALIGNMENT
+        blobs.append(blob + bytes(padding))
+        offset += len(blob) + padding
+        return start
+
+    for category, image_dict in IMAGES.items():
+        image_format = 'RGB' if category in OPAQUE_CATEGORIES else 'RGBA'
+        for image_path in image_dict.values():
+            if image_path in header['images']:
+                continue
+            image = pygame.image.load(image_path)
+            header['images'][image_path] = {
+                'offset': add_blob(pygame.image.tobytes(image, image_format)),
+                'width': image.get_width(),
+                'height': image.get_height(),
+                'format': image_format,
+                **source_stamp(image_path),
+            }
+
+    # Store the samples in the same format SoundManager opens the mixer with
+    pygame.mixer.init(buffer=4096)
+    header['mixer_format'] = pygame.mixer.get_init()
+    for sound_path in sorted(Path(sounds_dir).glob('*.wav')):
+        samples = pygame.mixer.Sound(sound_path).get_raw()
+        header['sounds'][sound_path.stem] = {'offset': add_blob(samples), 'length': len(samples),
+                                             'path': sound_path.as_posix(), **source_stamp(sound_path)}
+
+    header_bytes = json.dumps(header).encode()
+    with open(path, 'wb') as bundle_file:
+        bundle_file.write(MAGIC)
+        bundle_file.write(struct.pack('<I', len(header_bytes)))
+        bundle_file.write(header_bytes)
+        bundle_file.write(bytes(-bundle_file.tell() % ALIGNMENT))
+        for blob in blobs:
+            bundle_file.write(blob)
+    print(f"Bundled {len(header['images'])} images and {len(header['sounds'])} sounds "
+          f"into {path} ({Path(path).stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Bundle the game's images and sounds.")
+    parser.add_argument('--output', default=BUNDLE_PATH, help="where to write the bundle")
+    args = parser.parse_args()
+
+    # Decoding sounds needs the mixer, but not a sound card
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    build_bundle(args.output)
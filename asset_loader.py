@@ -0,0 +1,79 @@
+import queue
+import threading
+from images import IMAGES, OPAQUE_CATEGORIES
+
+
+class AssetLoader:
+    """Load categories of images in the background.
+
+    A worker thread decodes the images, which is the slow part, and the main
+    thread converts them for the display as they arrive by calling `poll`,
+    since surfaces can only be converted on the thread owning the display.
+    """
+
+    def __init__(self, image_retrieve, categories):
+        """Initialize the loader for the given categories of IMAGES."""
+        self.image_retrieve = image_retrieve
+        self.categories = tuple(categories)
+
+        # Categories still to decode, guarded by the lock
+        self.waiting = list(categories)
+        self.lock = threading.Lock()
+        self.decoded = queue.Queue()
+
+        self.thread = threading.Thread(target=self._decode_categories, daemon=True)
+
+    def start(self):
+        """Start decoding on the worker thread."""
+        self.thread.start()
+
+    def request(self, category):
+        """Decode a category before any other still waiting, e.g. ahead of a boss fight."""
+        with self.lock:
+            if category in self.waiting:
+                self.waiting.remove(category)
+                self.waiting.insert(0, category)
+
+    def poll(self, timeout=0):
+        """Convert every category decoded so far, waiting up to `timeout` seconds for one."""
+        try:
+            category, decoded = self.decoded.get(timeout=timeout) if timeout else self.decoded.get_nowait()
+        except queue.Empty:
+            return
+
+        while True:
+            if isinstance(decoded, Exception):
+                raise decoded
+            self.image_retrieve.add_category(category, decoded)
+            try:
+                category, decoded = self.decoded.get_nowait()
+            except queue.Empty:
+                return
+
+    def is_loaded(self, *categories):
+        """Return True if all the given categories are ready to use."""
+        return all(self.image_retrieve.is_loaded(category) for category in categories)
+
+    @property
+    def progress(self):
+        """Return the share of categories loaded, between 0 and 1."""
+        if not self.categories:
+            return 1.0
+        loaded = sum(self.image_retrieve.is_loaded(category) for category in self.categories)
+        return loaded / len(self.categories)
+
+    def _decode_categories(self):
+        """Decode the waiting categories one by one, on the worker thread."""
+        while True:
+            with self.lock:
+                if not self.waiting:
+                    return
+                category = self.waiting.pop(0)
+            if self.image_retrieve.is_loaded(category):
+                continue
+            try:
+                decoded = self.image_retrieve.decode_images(
+                    IMAGES[category], category in OPAQUE_CATEGORIES)
+            except Exception as error:  # Raised again on the main thread by poll
+                decoded = error
+            self.decoded.put((category, decoded))
@@ -0,0 +1,194 @@
+"""Benchmark the hot paths of the game by simulating it headlessly.
+
+Each scenario sets up a game state, then plays a fixed number of frames with
+rendering on and reports the frames per second, the p50/p95/p99 of every
+frame phase and how many garbage collections ran. Each scenario is then
+played again under tracemalloc, which slows the game down too much to time
+it, to report the most memory the frames allocated on top of what the
+setup left and how much of it was still held at the end. Results can be saved as a baseline and later runs are
+compared against it:
+
+    python benchmark.py --save-baseline
+    python benchmark.py              # exits with 1 if a scenario got slower
+"""
+import gc
+import os
+import sys
+import tracemalloc
+import json
+import argparse
+import pygame
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from time import perf_counter
+from alien import Alien
+from alien_invasion import AlienInvasion
+from input_script import InputScript
+from profiler import FrameProfiler, PHASES
+from upgrades import Upgrade
+
+BASELINE_PATH = Path('benchmark_baseline.json')
+
+
+def setup_circular_fleet(ai, script):
+    """Fill the screen with a circular fleet of aliens."""
+    ai.fleet.create_fleet(1, 'circular')
+
+
+def setup_alien_bullet_storm(ai, script, count=5000):
+    """Fire thousands of alien bullets from all over the screen."""
+    shooter = Alien(ai)  # Only used as a position to fire from
+    rng = ai.rng.shooting
+    for _ in range(count):
+        shooter.rect.center = (rng.randrange(ai.settings.screen_width),
+                               rng.randrange(ai.settings.screen_height))
+        ai.alien_bullets.add(ai.alien_bullet_pool.acquire(shooter))
+
+
+def setup_boss_fight(ai, script):
+    """Start the boss fight of level 5."""
+    ai.stats.level = 5
+    ai._start_boss_fight()
+
+
+def setup_rapid_fire(ai, script):
+    """Fire every other frame at a group of aliens with the shooting speed upgrade."""
+    Upgrade('shooting_speed', (0, 0), ai.image_retrieve).apply_upgrade(ai.ship)
+    rng = ai.rng.spawns
+    for _ in range(20):
+        alien = Alien(ai)
+        alien.place(rng.randint(0, ai.settings.screen_width - 50), rng.randint(-100, -40))
+        ai.aliens.add(alien)
+
+    script.move_mouse(0, (ai.settings.screen_width // 2, 0))
+    for frame in range(0, 100_000, 2):
+        script.tap(frame, pygame.K_SPACE)
+
+
+SCENARIOS = {
+    'circular_fleet': setup_circular_fleet,
+    'alien_bullet_storm': setup_alien_bullet_storm,
+    'boss_fight': setup_boss_fight,
+    'rapid_fire': setup_rapid_fire,
+}
+
+
+def set_up_scenario(name, frames, seed):
+    """Start a headless game in a scenario, return it with its input script."""
+    with quiet():
+        ai = AlienInvasion(headless=True, seed=seed)
+        ai.profiler = FrameProfiler(ai, window=frames)
+        ai._start_game()
+        ai.alien_population.clear()  # Only the aliens of the scenario
+
+        script = InputScript()
+        SCENARIOS[name](ai, script)
+    return ai, script
+
+
+@contextmanager
+def quiet():
+    """Drop the debug output of the game, so the timings don't include terminal I/O."""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        yield
+
+
+def measure_memory(name, frames, seed):
+    """Play a scenario under tracemalloc, return the peak and retained KiB of its frames."""
+    ai, script = set_up_scenario(name, frames, seed)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        with quiet():
+            ai.run_simulation(frames, script, render=True, new_game=False)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - start) / 1024, (current - start) / 1024
+
+
+def run_scenario(name, frames, seed):
+    """Play a scenario and return its results."""
+    ai, script = set_up_scenario(name, frames, seed)
+
+    gc.collect()
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    start = perf_counter()
+
+    with quiet():
+        ai.run_simulation(frames, script, render=True, new_game=False)
+
+    elapsed = perf_counter() - start
+    frames_played = ai.frame + 1
+    collections = sum(stats['collections'] for stats in gc.get_stats()) - collections
+    peak_kib, retained_kib = measure_memory(name, frames, seed)
+    return {
+        'frames': frames_played,
+        'fps': frames_played / elapsed,
+        'phases': {phase: dict(zip(('p50', 'p95', 'p99'), ai.profiler.percentiles(phase)))
+                   for phase in ('frame',) + PHASES},
+        'gc_collections': collections,
+        'peak_allocated_kib': peak_kib,
+        'retained_kib': retained_kib,
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """Return a message for every result that is slower than the baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if result['fps'] < expected['fps'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['fps']:.1f} FPS, baseline {expected['fps']:.1f}")
+        for phase, timings in result['phases'].items():
+            expected_p95 = expected['phases'][phase]['p95']
+            if timings['p95'] > expected_p95 * (1 + tolerance) and timings['p95'] - expected_p95 > 0.05:
+                regressions.append(f"{name}: {phase} p95 {timings['p95']:.2f} ms, "
+                                   f"baseline {expected_p95:.2f} ms")
+    return regressions
+
+
+def print_result(name, result):
+    """Print the results of one scenario."""
+    print(f"{name}: {result['frames']} frames, {result['fps']:.1f} FPS, "
+          f"{result['gc_collections']} GC collections, "
+          f"{result['peak_allocated_kib']:.0f} KiB peak allocated, "
+          f"{result['retained_kib']:+.0f} KiB retained")
+    for phase, timings in result['phases'].items():
+        print(f"    {phase:<16} p50 {timings['p50']:7.3f}  p95 {timings['p95']:7.3f}  "
+              f"p99 {timings['p99']:7.3f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark Alien Invasion.")
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"scenarios to run, all by default: {', '.join(SCENARIOS)}")
+    parser.add_argument('--frames', type=int, default=600, help="frames to play per scenario")
+    parser.add_argument('--seed', type=int, default=0, help="seed of every scenario")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="baseline file")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="save the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="slowdown allowed before a result is a regression")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario '{name}'")
+
+    results = {}
+    for name in args.scenarios or SCENARIOS:
+        results[name] = run_scenario(name, args.frames, args.seed)
+        print_result(name, results[name])
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+    elif args.baseline.exists():
+        regressions = find_regressions(results, json.loads(args.baseline.read_text()),
+                                       args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
@@ -1,7 +1,6 @@
-import pygame
 import math
 from pygame.sprite import Sprite
-from images import Images
+from kinematics import Kinematics
 
 class Bullet(Sprite):
     """A class to manage bullets fired from the ship"""
@@ -11,18 +10,36 @@ class Bullet(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.image = Images()
-        self.image_retrieve = self.image.bullets[bullet_type]
+        self.ship = ai_game.ship
+        self.images = ai_game.image_retrieve
+        self.rotations = ai_game.image_retrieve.rotations
+        self.kinematics = Kinematics()
+        self.engine_slot = None
+
+        self.reset(mouse_x, mouse_y, bullet_type)
+
+    def reset(self, mouse_x, mouse_y, bullet_type):
+        """Fire the bullet again from the ship, towards the mouse."""
+        self.image_retrieve = self.images.bullets[bullet_type]
         
-        self.rect = self.image_retrieve.get_rect(center=ai_game.ship.rect.center)
+        self.rect = self.image_retrieve.get_rect(center=self.ship.rect.center)
         
         self._calc_direction(mouse_x, mouse_y)
         
         self._rotate_bullet()
+
+        # Fit the rect to the rotated image, which is what gets drawn and hit
+        self.image = self.image_retrieve
+        self.rect = self.image.get_rect(center=self.rect.center)
         
         self.speed = self.settings.bullet_speed
         self.delta_time = 0
 
+        kinematics = self.kinematics
+        kinematics.place(self.rect)
+        kinematics.vx = self.dir[0] * self.speed
+        kinematics.vy = self.dir[1] * self.speed
+
     def _calc_direction(self, mouse_x, mouse_y):
         """Calculate direction vector and normalize it."""
         self.dir = (mouse_x - self.rect.x, mouse_y - self.rect.y)
@@ -35,33 +52,84 @@ class Bullet(Sprite):
     def _rotate_bullet(self):
         """Rotate the bullet surface."""
         angle = math.degrees(math.atan2(-self.dir[1], self.dir[0]))
-        self.image_retrieve = pygame.transform.rotate(self.image_retrieve, angle)
+        self.image_retrieve = self.rotations.rotate(self.image_retrieve, angle)
         
     def update(self, delta_time):
         """Move the bullet across the screen"""
         # Update position using direction vector and delta time
-        self.rect.move_ip(self.dir[0] * self.speed * delta_time, self.dir[1] * self.speed * delta_time)
+        self.kinematics.move(self.rect, delta_time)
 
-    def draw_bullet(self):
-        """Draw the bullet to the screen"""
-        self.screen.blit(self.image_retrieve, self.rect)
+    def draw_bullet(self, position=None):
+        """Draw the bullet to the screen, at a given position if any, return the rect drawn"""
+        return self.screen.blit(self.image_retrieve, self.rect if position is None else position)
 
 class AlienBullet(Sprite):
     """A class for bullets shot by the aliens."""
 
-    def __init__(self, alien, ai_game):
+    def __init__(self, ai_game, alien):
+        """Initialize the alien bullet attributes."""
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.image_retrieve = Images()
-        self.image = self.image_retrieve.bullets['alien_bullet']
+        self.image = ai_game.image_retrieve.bullets['alien_bullet']
+        self.dir = (0, 1)  # Alien bullets always fall straight down
+        self.kinematics = Kinematics()
+        self.engine_slot = None
+
+        self.reset(alien)
+
+    def reset(self, alien):
+        """Fire the bullet again from the alien's position."""
         self.rect = self.image.get_rect(center=alien.rect.center)
         self.speed = self.settings.alien_bullet_speed
+        self.kinematics.place(self.rect)
+        self.kinematics.vy = self.speed
 
     def update(self, delta_time):
         """Move the bullet down the screen."""
-        self.rect.y += self.speed * delta_time
+        self.kinematics.move(self.rect, delta_time)
+
+    def draw_bullet(self, position=None):
+        """Draw the alien bullet to the screen, at a given position if any, return the rect drawn."""
+        return self.screen.blit(self.image, self.rect if position is None else position)
+
+
+class BulletPool:
+    """A fixed-capacity free list of bullets, reused instead of reallocated."""
+
+    def __init__(self, ai_game, bullet_class, capacity, engine=None):
+        """Initialize an empty pool for one class of bullets.
+
+        If a BulletEngine is given, acquired bullets are simulated by it.
+        """
+        self.ai_game = ai_game
+        self.bullet_class = bullet_class
+        self.capacity = capacity
+        self.engine = engine
+        self.free_bullets = []
+
+    def acquire(self, *args):
+        """Return a bullet reset with the given arguments, reusing a free one if possible."""
+        if self.free_bullets:
+            bullet = self.free_bullets.pop()
+            bullet.reset(*args)
+            self.ai_game.forget_previous_position(bullet)  # Fired from a new spot
+        else:
+            bullet = self.bullet_class(self.ai_game, *args)
+
+        if self.engine:
+            self.engine.add(bullet)
+        return bullet
+
+    def release(self, bullet):
+        """Remove the bullet from its groups and keep it for reuse."""
+        bullet.kill()
+        if self.engine:
+            self.engine.remove(bullet)
+        if len(self.free_bullets) < self.capacity:
+            self.free_bullets.append(bullet)
 
-    def draw_bullet(self):
-        """Draw the alien bullet to the screen."""
-        self.screen.blit(self.image, self.rect)
\ No newline at end of file
+    def release_all(self, group):
+        """Release every bullet in a group."""
+        for bullet in group.sprites():
+            self.release(bullet)
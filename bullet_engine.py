@@ -0,0 +1,103 @@
+try:
+    import numpy as np
+except ImportError:  # The vectorized engine is optional
+    np = None
+
+
+class BulletEngine:
+    """Advance and cull a whole set of bullets with NumPy arrays.
+
+    Each bullet owns a slot in structure-of-arrays storage for its exact
+    position, velocity and size. One call to `update` moves every bullet,
+    finds the ones that left the screen and syncs the rects that
+    `draw_bullet` and the collision checks use.
+    """
+
+    def __init__(self, screen_rect, capacity=256):
+        """Initialize empty arrays for the bullets."""
+        self.screen_width = screen_rect.width
+        self.screen_height = screen_rect.height
+
+        self.positions = np.zeros((capacity, 2))
+        self.previous_positions = np.zeros((capacity, 2))  # Before the last update
+        self.velocities = np.zeros((capacity, 2))
+        self.sizes = np.zeros((capacity, 2))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.bullets = [None] * capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    @staticmethod
+    def is_available():
+        """Return True if NumPy is installed."""
+        return np is not None
+
+    def add(self, bullet):
+        """Start simulating a bullet from its rect, direction and speed."""
+        if not self.free_slots:
+            self._grow()
+        slot = self.free_slots.pop()
+
+        self.positions[slot] = bullet.rect.topleft
+        self.previous_positions[slot] = bullet.rect.topleft
+        self.velocities[slot] = (bullet.dir[0] * bullet.speed, bullet.dir[1] * bullet.speed)
+        self.sizes[slot] = bullet.rect.size
+        self.alive[slot] = True
+        self.bullets[slot] = bullet
+        bullet.engine_slot = slot
+
+    def remove(self, bullet):
+        """Stop simulating a bullet and free its slot."""
+        slot = bullet.engine_slot
+        if slot is None:
+            return
+        self.alive[slot] = False
+        self.bullets[slot] = None
+        self.free_slots.append(slot)
+        bullet.engine_slot = None
+
+    def update(self, delta_time):
+        """Move every bullet and return the ones that left the screen."""
+        np.copyto(self.previous_positions, self.positions)
+        self.positions += self.velocities * delta_time
+
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        vx, vy = self.velocities[:, 0], self.velocities[:, 1]
+
+        # A bullet is gone once it is past an edge it is moving towards, so
+        # alien bullets fired from above the screen still fly into view
+        gone = self.alive & (
+            ((x + self.sizes[:, 0] < 0) & (vx < 0))
+            | ((x > self.screen_width) & (vx > 0))
+            | ((y + self.sizes[:, 1] < 0) & (vy < 0))
+            | ((y > self.screen_height) & (vy > 0)))
+
+        # Sync the integer rects used for drawing and collisions,
+        # from flat columns, so no list is built per bullet
+        live = np.flatnonzero(self.alive & ~gone)
+        bullets = self.bullets
+        for slot, left, top in zip(live.tolist(), self.positions[live, 0].tolist(),
+                                   self.positions[live, 1].tolist()):
+            bullets[slot].rect.topleft = (left, top)
+
+        return [bullets[slot] for slot in np.flatnonzero(gone).tolist()]
+
+    def hold(self):
+        """Keep every bullet where it is, so it is drawn there until the next update."""
+        np.copyto(self.previous_positions, self.positions)
+
+    def interpolate(self, alpha):
+        """Return the x and y to draw each slot at, `alpha` of the way from the previous update."""
+        previous = self.previous_positions
+        positions = previous + (self.positions - previous) * alpha
+        return positions[:, 0].tolist(), positions[:, 1].tolist()
+
+    def _grow(self):
+        """Double the capacity of the arrays."""
+        capacity = len(self.bullets)
+        self.positions = np.concatenate((self.positions, np.zeros((capacity, 2))))
+        self.previous_positions = np.concatenate((self.previous_positions, np.zeros((capacity, 2))))
+        self.velocities = np.concatenate((self.velocities, np.zeros((capacity, 2))))
+        self.sizes = np.concatenate((self.sizes, np.zeros((capacity, 2))))
+        self.alive = np.concatenate((self.alive, np.zeros(capacity, dtype=bool)))
+        self.bullets.extend([None] * capacity)
+        self.free_slots.extend(range(2 * capacity - 1, capacity - 1, -1))
@@ -15,7 +15,8 @@ class Button:
         self.width, self.height = 200, 50
         self.button_color = self.base_color
         self.text_color = (255,255,255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.fonts.get(None, 48)
+        self.msg_images = {}  # The rendered message for each button color
 
         # Build the button's rect object and center it
         self.rect = pygame.Rect(0,0, self.width, self.height)
@@ -26,8 +27,10 @@ class Button:
 
     def _button_msg(self):
         """Turn the message into a rendered image and center the text on the button."""
-        self.msg_image = self.font.render(self.msg, True, 
-                self.text_color, self.button_color)
+        if self.button_color not in self.msg_images:
+            self.msg_images[self.button_color] = self.font.render(self.msg, True, 
+                    self.text_color, self.button_color)
+        self.msg_image = self.msg_images[self.button_color]
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
 
@@ -46,6 +49,7 @@ class Button:
         self._button_msg()
 
     def draw_button(self):
-        """Draw the blank button and then draw the message."""
+        """Draw the blank button and then draw the message, return the rect drawn."""
         self.screen.fill(self.button_color, self.rect)
         self.screen.blit(self.msg_image, self.msg_image_rect)
+        return self.rect
@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    """A uniform grid over the screen for broad-phase collision checks.
+
+    Sprites are bucketed by the grid cells their rect covers, so a query only
+    runs exact rect tests against the sprites sharing a cell with it instead
+    of against the whole group.
+    """
+
+    def __init__(self, cell_size):
+        """Initialize an empty grid with square cells of the given size."""
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+    def rebuild(self, sprites):
+        """Empty the grid and insert every sprite at its current position."""
+        self.cells.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def insert(self, sprite):
+        """Add a sprite to every cell its rect covers."""
+        for cell in self._cells_for(sprite.rect):
+            self.cells[cell].append(sprite)
+
+    def collide(self, rect):
+        """Return the live sprites whose rect overlaps the given rect."""
+        hits = {}
+        for cell in self._cells_for(rect):
+            for sprite in self.cells.get(cell, ()):
+                # Sprites killed since the rebuild are skipped
+                if sprite not in hits and sprite.alive() and rect.colliderect(sprite.rect):
+                    hits[sprite] = True
+        return list(hits)
+
+    def sweep(self, rect, previous_rect):
+        """Return the live sprites a rect touched on its way from previous_rect.
+
+        The rect moved in a straight line, so sprites it jumped over in a
+        single step are found as well as those it overlaps now.
+        """
+        if rect.topleft == previous_rect.topleft:
+            return self.collide(rect)
+        return [sprite for sprite in self.collide(rect.union(previous_rect))
+                if rect.colliderect(sprite.rect) or swept_through(rect, previous_rect, sprite.rect)]
+
+    def _cells_for(self, rect):
+        """Yield the grid cells covered by a rect."""
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cell_x, cell_y
+
+
+def swept_through(rect, previous_rect, other_rect):
+    """Return True if a rect moving in a straight line from previous_rect passed through other_rect.
+
+    Growing the other rect by half the moving rect on every side turns the
+    test into one of the segment the center moved along.
+    """
+    target = other_rect.inflate(rect.width, rect.height)
+    return bool(target.clipline(previous_rect.center, rect.center))
@@ -1,33 +1,137 @@
 import math
-import random
-from alien import Alien
+from alien import Alien, ALIEN_IMAGES
+
+try:
+    import numpy as np
+except ImportError:  # Fleets are laid out one alien at a time without NumPy
+    np = None
+
+FLEET_PATTERNS = ('random', 'circular', 'spiral', 'clustered')
+
+# Patterns that only depend on the screen and alien sizes, laid out once
+CACHED_PATTERNS = ('circular', 'spiral')
 
 class FleetStructure:
-    """A class to control the position of the alien fleet."""
+    """A class to control the position of the alien fleet.
+
+    With NumPy, each pattern computes the positions of the whole fleet as
+    arrays, and the aliens are then created and added in one go. Layouts of
+    the patterns with no randomness are kept for the next fleet of the same
+    pattern, screen size and alien size.
+    """
 
     def __init__(self, ai_game):
         """Initialize the relevant parameters."""
         self.ai_game = ai_game
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.image_retrieve = ai_game.image_retrieve
         self.aliens = ai_game.aliens
+        self.rng = ai_game.rng
+        self.layouts = {}
+
+    def create_fleet(self, alien_type, pattern=None):
+        """Create the fleet of alien ships, in the given pattern or a random one."""
+        alien_width, alien_height = self.image_retrieve.aliens[ALIEN_IMAGES[alien_type]].get_size()
 
-    def create_fleet(self, alien_type):
-        """Create the fleet of alien ships."""
-        alien = Alien(self, alien_type)
-        alien_width, alien_height = alien.rect.size
-
-        fleet_patterns = [
-            (self._create_random_fleet, "Random"),
-            (self._create_circular_fleet, "Circular"),
-            (self._create_spiral_fleet, "Spiral"),
-            (self._create_clustered_fleet, "Clustered"),
-        ]
-        
         # Choose and execute a random pattern
-        pattern_func, pattern_name = random.choice(fleet_patterns)
-        print(f"Creating fleet pattern: {pattern_name}")  # Debug log
-        pattern_func(alien_type, alien_width, alien_height)
+        if pattern is None:
+            pattern = self.rng.fleets.choice(FLEET_PATTERNS)
+        print(f"Creating fleet pattern: {pattern.capitalize()}")  # Debug log
+
+        if np is None:
+            create_pattern = getattr(self, f'_create_{pattern}_fleet')
+            create_pattern(alien_type, alien_width, alien_height)
+        else:
+            self._create_aliens(self._layout(pattern, alien_width, alien_height), alien_type)
+
+    def _layout(self, pattern, alien_width, alien_height):
+        """Return the positions of the aliens in a pattern, from the cache if possible."""
+        key = (pattern, (self.settings.screen_width, self.settings.screen_height),
+               (alien_width, alien_height))
+        positions = self.layouts.get(key)
+        if positions is None:
+            layout = getattr(self, f'_{pattern}_layout')
+            positions = layout(alien_width, alien_height).tolist()
+            if pattern in CACHED_PATTERNS:
+                self.layouts[key] = positions
+        return positions
+
+    def _create_aliens(self, positions, alien_type):
+        """Create an alien at each position that fits and add them all to the game at once."""
+        positions = positions[:self.ai_game.alien_population.room()]
+        aliens = [Alien(self.ai_game, alien_type) for _ in positions]
+        for alien, (x, y) in zip(aliens, positions):
+            alien.place(x, y)
+        self.ai_game.alien_population.add_fleet(aliens)
+
+    def _random_layout(self, alien_width, alien_height):
+        """Return the positions of a grid of aliens with random gaps."""
+        screen_width, screen_height = self.settings.screen_width, self.settings.screen_height
+        max_columns = screen_width // (alien_width * 2)
+        max_rows = screen_height // (alien_height * 3)
+        columns = max(5, max_columns - len(self.aliens) // 5)
+        rows = max(3, max_rows - len(self.aliens) // 10)
+
+        x_spacing = alien_width + self.rng.fleets.randint(alien_width // 2, alien_width)
+        y_spacing = alien_height + self.rng.fleets.randint(alien_height // 2, alien_height)
+
+        # Skip some positions for randomness, drawn from the fleets stream
+        generator = np.random.default_rng(self.rng.fleets.getrandbits(64))
+        row, col = np.divmod(np.arange(rows * columns), columns)
+        keep = generator.random(rows * columns) > 0.2
+        x = (alien_width + col[keep] * x_spacing) % (screen_width - alien_width)
+        y = (alien_height + row[keep] * y_spacing) % (screen_height // 2)
+        return np.column_stack((x, y))
+
+    def _circular_layout(self, alien_width, alien_height):
+        """Return the positions of aliens on three concentric circles."""
+        center_x = self.settings.screen_width // 2
+        center_y = self.settings.screen_height // 4
+        max_radius = min(center_x, center_y) - alien_width
+        num_circles = 3
+
+        # 8 aliens on the inner circle, 16 on the next one and so on
+        circle = np.repeat(np.arange(1, num_circles + 1), 8 * np.arange(1, num_circles + 1))
+        index = np.concatenate([np.arange(8 * c) for c in range(1, num_circles + 1)])
+        radius = circle * max_radius // num_circles
+        angle = 2 * np.pi * index / (8 * circle)
+        x = center_x + np.trunc(radius * np.cos(angle)).astype(int) - alien_width // 2
+        y = center_y + np.trunc(radius * np.sin(angle)).astype(int) - alien_height // 2
+        return np.column_stack((x, y))
+
+    def _spiral_layout(self, alien_width, alien_height):
+        """Return the positions of aliens on a spiral, leaving out those off the screen."""
+        center_x = self.settings.screen_width // 2
+        center_y = self.settings.screen_height // 4
+
+        index = np.arange(30)
+        angle = index * (np.pi / 6)
+        radius = index * (alien_width // 2)
+        x = center_x + np.trunc(radius * np.cos(angle)).astype(int) - alien_width // 2
+        y = center_y + np.trunc(radius * np.sin(angle)).astype(int) - alien_height // 2
+
+        on_screen = ((0 < x) & (x < self.settings.screen_width - alien_width)
+                     & (0 < y) & (y < self.settings.screen_height // 2))
+        return np.column_stack((x[on_screen], y[on_screen]))
+
+    def _clustered_layout(self, alien_width, alien_height):
+        """Return the positions of aliens in clusters around random centers."""
+        num_clusters = 5
+        aliens_per_cluster = 6
+        generator = np.random.default_rng(self.rng.fleets.getrandbits(64))
+
+        center_x = generator.integers(alien_width * 2, self.settings.screen_width - alien_width * 2,
+                                      num_clusters, endpoint=True)
+        center_y = generator.integers(alien_height * 2, self.settings.screen_height // 2 - alien_height * 2,
+                                      num_clusters, endpoint=True)
+        offset_x = generator.integers(-alien_width, alien_width, (num_clusters, aliens_per_cluster),
+                                      endpoint=True)
+        offset_y = generator.integers(-alien_height, alien_height, (num_clusters, aliens_per_cluster),
+                                      endpoint=True)
+        x = (center_x[:, np.newaxis] + offset_x).ravel()
+        y = (center_y[:, np.newaxis] + offset_y).ravel()
+        return np.column_stack((x, y))
 
     def _create_random_fleet(self, alien_type, alien_width, alien_height):
         """Create a dynamic fleet of alien ships."""
@@ -42,13 +146,13 @@ class FleetStructure:
         rows = max(3, max_rows - len(self.aliens) // 10)
 
         # Spacing factors for variety
-        x_spacing = alien_width + random.randint(alien_width // 2, alien_width)
-        y_spacing = alien_height + random.randint(alien_height // 2, alien_height)
+        x_spacing = alien_width + self.rng.fleets.randint(alien_width // 2, alien_width)
+        y_spacing = alien_height + self.rng.fleets.randint(alien_height // 2, alien_height)
 
         # Start creating aliens in a grid with random gaps
         for row in range(rows):
             for col in range(columns):
-                if random.random() > 0.2:  # Skip some positions for randomness
+                if self.rng.fleets.random() > 0.2:  # Skip some positions for randomness
                     x = (alien_width + col * x_spacing) % (screen_width - alien_width)
                     y = (alien_height + row * y_spacing) % (screen_height // 2)
                     self._create_alien(x, y, alien_type)
@@ -99,22 +203,22 @@ class FleetStructure:
         
         for cluster in range(num_clusters):
             # Random cluster center within screen bounds
-            center_x = random.randint(alien_width * 2, self.settings.screen_width - alien_width * 2)
-            center_y = random.randint(alien_height * 2, self.settings.screen_height // 2 - alien_height * 2)
+            center_x = self.rng.fleets.randint(alien_width * 2, self.settings.screen_width - alien_width * 2)
+            center_y = self.rng.fleets.randint(alien_height * 2, self.settings.screen_height // 2 - alien_height * 2)
             
             for i in range(aliens_per_cluster):
                 # Random position around the cluster center
-                offset_x = random.randint(-alien_width, alien_width)
-                offset_y = random.randint(-alien_height, alien_height)
+                offset_x = self.rng.fleets.randint(-alien_width, alien_width)
+                offset_y = self.rng.fleets.randint(-alien_height, alien_height)
                 x = center_x + offset_x
                 y = center_y + offset_y
                 self._create_alien(x, y, alien_type)
 
     def _create_alien(self, x_position, y_position, alien_type):
-        """Create a new alien at the defined x and y positions."""
-        new_alien = Alien(self, alien_type)
-        new_alien.x = x_position
-        new_alien.rect.x = x_position
-        new_alien.rect.y = y_position
-        self.aliens.add(new_alien)
+        """Create a new alien at the defined x and y positions, if it fits."""
+        if not self.ai_game.alien_population.room():
+            return
+        new_alien = Alien(self.ai_game, alien_type)
+        new_alien.place(x_position, y_position)
+        self.ai_game.alien_population.add_fleet([new_alien])
 
@@ -1,4 +1,14 @@
+import json
+import weakref
+import threading
 import pygame
+from pathlib import Path
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # Gradients are drawn line by line without NumPy
+    np = None
 
 
 IMAGES = { 
@@ -20,21 +30,197 @@ IMAGES = {
     'BOSS': {'boss': 'images/first_boss.png'},
 }
 
+# Categories of fully opaque images, converted without per-pixel alpha
+OPAQUE_CATEGORIES = ('BACKGROUNDS',)
+
+# Categories only needed later in the game, they keep loading once it has
+# started and are left out of the atlas so they are really decoded later
+DEFERRED_CATEGORIES = ('BOSS',)
+
+# Index of the sprite atlas built by pack_atlas.py
+ATLAS_INDEX = 'images/atlas.json'
+
 class Images:
-    """Initiate all images for the game."""
+    """Shared registry of all the images for the game.
 
-    def __init__(self):
-        """Initialize the images."""
-        self.upgrades = self.load_images(IMAGES['UPGRADES'])
-        self.aliens = self.load_images(IMAGES['ALIENS'])
-        self.ships = self.load_images(IMAGES['SHIPS'])
-        self.bullets = self.load_images(IMAGES['BULLETS'])
-        self.backgrounds = self.load_images(IMAGES['BACKGROUNDS'])
-        self.boss = self.load_images(IMAGES['BOSS'])
-
-    def load_images(self, image_dict):
+    A single instance is created by the game and handed to every sprite, so
+    each image is decoded from disk only once. Categories of IMAGES are loaded
+    lazily the first time they are accessed (e.g. `images.bullets`).
+    Images are converted to the display's pixel format when loaded, and the
+    screen-sized backgrounds and gradients are cached per resolution.
+
+    Images are taken from the AssetBundle if one is given, which needs no
+    decoding. Otherwise with `use_atlas`, sprites packed by pack_atlas.py are
+    sliced out of the atlas sheet, decoded once. Any other image is loaded
+    from its own file.
+    """
+
+    def __init__(self, use_atlas=False, bundle=None):
+        """Initialize the registry, images are only loaded when requested."""
+        self.rotations = RotationCache()
+        self.masks = MaskCache()
+        self.screen_surfaces = {}
+        self.bundle = bundle
+
+        self.atlas_frames = {}
+        self.atlas_sheet = None
+        self.decoded_atlas_sheet = None
+        self.atlas_lock = threading.Lock()
+        if use_atlas and Path(ATLAS_INDEX).exists():
+            atlas_index = json.loads(Path(ATLAS_INDEX).read_text())
+            self.atlas_sheet_path = atlas_index['sheet']
+            self.atlas_frames = atlas_index['frames']
+
+    def __getattr__(self, name):
+        """Load a category of images the first time it is requested."""
+        category = name.upper()
+        if name.startswith('_') or category not in IMAGES:
+            raise AttributeError(f"No image category named '{name}'")
+
+        opaque = category in OPAQUE_CATEGORIES
+        return self.add_category(category, self.decode_images(IMAGES[category], opaque))
+
+    def add_category(self, category, decoded):
+        """Convert and keep the decoded images of a category, unless already loaded."""
+        name = category.lower()
+        if name not in self.__dict__:
+            images = self.convert_images(decoded, category in OPAQUE_CATEGORIES)
+            setattr(self, name, images)  # Cache so later lookups skip __getattr__
+        return self.__dict__[name]
+
+    def is_loaded(self, category):
+        """Return True if a category of images has been loaded."""
+        return category.lower() in self.__dict__
+
+    def load_images(self, image_dict, opaque=False):
         """Load all images from a dictionary."""
-        images = {}
+        return self.convert_images(self.decode_images(image_dict, opaque), opaque)
+
+    def decode_images(self, image_dict, opaque=False):
+        """Read all images from a dictionary, without converting them.
+
+        Safe to call from a worker thread, the images are then converted for
+        the display on the main thread with `convert_images`.
+        """
+        decoded = {}
         for key, value in image_dict.items():
-            images[key] = pygame.image.load(value).convert_alpha()
-        return images
\ No newline at end of file
+            if self.bundle and self.bundle.has_image(value):
+                decoded[key] = self.bundle.decode_image(value)
+            elif not opaque and value in self.atlas_frames:
+                # Sliced out of the atlas sheet once it is converted
+                self._decode_atlas_sheet()
+                decoded[key] = pygame.Rect(self.atlas_frames[value])
+            else:
+                decoded[key] = pygame.image.load(value)
+        return decoded
+
+    def convert_images(self, decoded, opaque=False):
+        """Convert decoded images to the display's pixel format."""
+        images = {}
+        for key, image in decoded.items():
+            if isinstance(image, pygame.Rect):
+                images[key] = self._load_atlas_sheet().subsurface(image)
+            else:
+                images[key] = image.convert() if opaque else image.convert_alpha()
+        return images
+
+    def _decode_atlas_sheet(self):
+        """Decode the atlas sheet the first time it is needed, on any thread."""
+        with self.atlas_lock:
+            if self.decoded_atlas_sheet is None:
+                self.decoded_atlas_sheet = pygame.image.load(self.atlas_sheet_path)
+        return self.decoded_atlas_sheet
+
+    def _load_atlas_sheet(self):
+        """Return the atlas sheet converted for the display, on the main thread."""
+        if self.atlas_sheet is None:
+            self.atlas_sheet = self._decode_atlas_sheet().convert_alpha()
+            self.decoded_atlas_sheet = None  # Only the converted sheet is kept
+        return self.atlas_sheet
+
+    def background(self, name, size):
+        """Return a background scaled to the screen size, cached per resolution."""
+        key = ('background', name, size)
+        if key not in self.screen_surfaces:
+            image = self.backgrounds[name]
+            if image.get_size() != size:
+                image = pygame.transform.smoothscale(image, size)
+            self.screen_surfaces[key] = image
+        return self.screen_surfaces[key]
+
+    def gradient(self, size, start_color, end_color):
+        """Return a vertical gradient filling the screen, cached per resolution."""
+        key = ('gradient', size, start_color, end_color)
+        if key not in self.screen_surfaces:
+            self.screen_surfaces[key] = self._draw_gradient(size, start_color, end_color)
+        return self.screen_surfaces[key]
+
+    def _draw_gradient(self, size, start_color, end_color):
+        """Draw a vertical gradient going from the top color to the bottom one."""
+        width, height = size
+        surface = pygame.Surface(size).convert()
+
+        if np is not None:
+            # Compute every row color at once and copy it across the width
+            rows = np.arange(height)[:, np.newaxis]
+            start = np.array(start_color)
+            colors = start + (np.array(end_color) - start) * rows // height
+            pygame.surfarray.blit_array(
+                surface, np.broadcast_to(colors, (width, height, 3)).copy())
+        else:
+            for y in range(height):
+                color = [start + (end - start) * y // height
+                         for start, end in zip(start_color, end_color)]
+                pygame.draw.line(surface, color, (0, y), (width, y))
+        return surface
+
+
+class RotationCache:
+    """Memoize rotated copies of images, quantized to a fixed number of angles."""
+
+    def __init__(self, steps=360, max_entries=4096):
+        """Initialize the cache with the angle steps and a memory bound."""
+        self.steps = steps
+        self.step_size = 360 / steps
+        self.max_entries = max_entries
+        self.rotated_images = OrderedDict()
+
+    def rotate(self, image, angle):
+        """Return the image rotated to the nearest angle step, in degrees."""
+        step = round(angle / self.step_size) % self.steps
+        key = (image, step)
+
+        rotated = self.rotated_images.get(key)
+        if rotated is None:
+            rotated = pygame.transform.rotate(image, step * self.step_size)
+            self.rotated_images[key] = rotated
+            # Drop the least recently used rotation once the cache is full
+            if len(self.rotated_images) > self.max_entries:
+                self.rotated_images.popitem(last=False)
+        else:
+            self.rotated_images.move_to_end(key)
+        return rotated
+
+
+class MaskCache:
+    """Build the collision mask of each image once, the first time it is needed.
+
+    Masks are kept as long as their surface, so rotated images dropped by
+    the RotationCache take their masks with them.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.masks = weakref.WeakKeyDictionary()
+
+    def get(self, image):
+        """Return the mask of the opaque pixels of an image."""
+        mask = self.masks.get(image)
+        if mask is None:
+            mask = self.masks[image] = pygame.mask.from_surface(image)
+        return mask
+
+    def overlap(self, image, rect, other_image, other_rect):
+        """Return True if two images drawn at two rects have opaque pixels in common."""
+        offset = (other_rect.x - rect.x, other_rect.y - rect.y)
+        return self.get(image).overlap(self.get(other_image), offset) is not None
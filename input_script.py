@@ -0,0 +1,41 @@
+import pygame
+from collections import defaultdict
+
+
+class InputScript:
+    """Keyboard and mouse input scripted frame by frame, for headless runs."""
+
+    def __init__(self, mouse_pos=(0, 0)):
+        """Initialize an empty script with the mouse at the given position."""
+        self.events = defaultdict(list)
+        self.mouse_moves = {}
+        self.mouse_pos = mouse_pos
+
+    def press(self, frame, key):
+        """Press a key down on the given frame."""
+        self.events[frame].append(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def release(self, frame, key):
+        """Release a key on the given frame."""
+        self.events[frame].append(pygame.event.Event(pygame.KEYUP, key=key))
+
+    def tap(self, frame, key):
+        """Press a key on the given frame and release it on the next one."""
+        self.press(frame, key)
+        self.release(frame + 1, key)
+
+    def move_mouse(self, frame, pos):
+        """Move the mouse on the given frame, it stays there until moved again."""
+        self.mouse_moves[frame] = pos
+
+    def click(self, frame, pos):
+        """Move the mouse and click on the given frame."""
+        self.move_mouse(frame, pos)
+        self.events[frame].append(
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+    def events_for(self, frame):
+        """Return the events of a frame and apply its mouse movement."""
+        if frame in self.mouse_moves:
+            self.mouse_pos = self.mouse_moves[frame]
+        return self.events.get(frame, [])
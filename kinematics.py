@@ -0,0 +1,35 @@
+class Kinematics:
+    """The exact position and velocity of a moving sprite.
+
+    Rects only hold whole pixels, so moving a rect by a small step loses the
+    fraction and slow sprites stall. The position is kept here as floats
+    instead, and copied to the rect after every move.
+    """
+
+    __slots__ = ('x', 'y', 'vx', 'vy')
+
+    def __init__(self, x=0.0, y=0.0, vx=0.0, vy=0.0):
+        """Initialize the position of the top left corner and the velocity."""
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+
+    def place(self, rect):
+        """Take the position from a rect that was moved directly."""
+        self.x, self.y = rect.topleft
+
+    def move(self, rect, delta_time):
+        """Move by the velocity and sync the rect."""
+        self.x += self.vx * delta_time
+        self.y += self.vy * delta_time
+        rect.topleft = (self.x, self.y)
+
+
+def move_sprites(sprites, delta_time):
+    """Move every sprite by its velocity and sync the rects, in a single pass."""
+    for sprite in sprites:
+        kinematics = sprite.kinematics
+        x = kinematics.x = kinematics.x + kinematics.vx * delta_time
+        y = kinematics.y = kinematics.y + kinematics.vy * delta_time
+        sprite.rect.topleft = (x, y)
@@ -1,4 +1,3 @@
-import pygame
 import math
 
 class MovementComponent:
@@ -67,9 +66,9 @@ class MovementComponent:
         self.entity.rect.x = self.x
         self.entity.rect.y = self.y
         
-    def update_rotation(self):
-        """Update rotation to face mouse pointer"""
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+    def update_rotation(self, target_pos):
+        """Update rotation to face the target, usually the mouse pointer"""
+        mouse_x, mouse_y = target_pos
         
         # Calculate angle between entity and mouse pointer
         dx = mouse_x - self.x
@@ -77,7 +76,7 @@ class MovementComponent:
         self.angle = math.degrees(math.atan2(-dy, dx)) - 90  # Adjust for image orientation
         
         # Rotate image and update rect
-        self.entity.image = pygame.transform.rotate(self.original_image, self.angle)
+        self.entity.image = self.entity.image_retrieve.rotations.rotate(self.original_image, self.angle)
         self.entity.rect = self.entity.image.get_rect(center=(self.x, self.y))
         
     def center_entity(self):
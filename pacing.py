@@ -0,0 +1,73 @@
+import pygame
+
+
+class FramePacer:
+    """Pace the main loop to the display, and sleep while nothing moves.
+
+    Scenes that play run at the refresh rate of the display. Idle scenes,
+    like the menu or the pause screen, and a minimized window instead block
+    on `pygame.event.wait` until an event arrives or their next frame is
+    due, so the game sleeps instead of spinning a CPU core. Frames that took
+    longer than their budget to run are counted as missed.
+    """
+
+    def __init__(self, clock, fallback_rate=120, minimized_rate=1):
+        """Initialize the pacer, using `fallback_rate` if the refresh rate is unknown."""
+        self.clock = clock
+        self.refresh_rate = self._display_refresh_rate() or fallback_rate
+        self.minimized_rate = minimized_rate
+
+        # Events taken off the queue while waiting, handled on the next frame
+        self.waited_events = []
+
+        self.frames = 0
+        self.missed_frames = 0
+        self.worst_frame_ms = 0
+
+    @staticmethod
+    def _display_refresh_rate():
+        """Return the refresh rate of the display, or 0 if pygame can't tell."""
+        get_refresh_rate = getattr(pygame.display, 'get_current_refresh_rate', None)
+        if get_refresh_rate is None:  # Only in pygame-ce
+            return 0
+        try:
+            return get_refresh_rate()
+        except pygame.error:
+            return 0
+
+    def get_events(self):
+        """Return the events of this frame, starting with any taken while waiting."""
+        events = self.waited_events + pygame.event.get()
+        self.waited_events = []
+        return events
+
+    def tick(self, scene):
+        """Wait until the next frame of the scene is due."""
+        if not pygame.display.get_active():
+            self._wait(self.minimized_rate)
+        elif scene.idle:
+            self._wait(scene.frame_rate)
+        else:
+            self.clock.tick(scene.frame_rate)
+            self._count_frame(1000 / scene.frame_rate)
+
+    def _wait(self, frame_rate):
+        """Sleep until an event arrives, or for at most a frame at `frame_rate`."""
+        event = pygame.event.wait(int(1000 / frame_rate))
+        if event.type != pygame.NOEVENT:
+            self.waited_events.append(event)
+        self.clock.tick()
+
+    def _count_frame(self, budget_ms):
+        """Record whether the frame that just ran fit in its budget."""
+        frame_ms = self.clock.get_rawtime()
+        self.frames += 1
+        if frame_ms > budget_ms:
+            self.missed_frames += 1
+        self.worst_frame_ms = max(self.worst_frame_ms, frame_ms)
+
+    def report(self):
+        """Return the missed-frame statistics as a line of text."""
+        share = self.missed_frames / self.frames if self.frames else 0.0
+        return (f"missed {self.missed_frames} of {self.frames} frames ({share:.1%}), "
+                f"worst {self.worst_frame_ms} ms at {self.refresh_rate} Hz")
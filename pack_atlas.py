@@ -0,0 +1,78 @@
+"""Pack the sprite images of the game into a single atlas sheet.
+
+Every image in `images.IMAGES`, apart from the opaque backgrounds and the
+categories deferred until later in the game, is copied into one PNG sheet,
+and a JSON index records where each source file ended up. `Images` then
+decodes the sheet once and slices the sprites out of it. Run it again
+whenever an image changes:
+
+    python pack_atlas.py
+"""
+import json
+import argparse
+import pygame
+from pathlib import Path
+from images import IMAGES, OPAQUE_CATEGORIES, DEFERRED_CATEGORIES, ATLAS_INDEX
+
+PADDING = 1  # Empty pixels between images, so they never bleed into each other
+
+
+def collect_images():
+    """Return the path of every image that belongs in the atlas."""
+    paths = []
+    for category, image_dict in IMAGES.items():
+        if category not in OPAQUE_CATEGORIES + DEFERRED_CATEGORIES:
+            paths.extend(path for path in image_dict.values() if path not in paths)
+    return paths
+
+
+def pack(sizes, max_width):
+    """Place rects of the given sizes on shelves, tallest first.
+
+    Returns the position of each rect and the size of the sheet.
+    """
+    order = sorted(range(len(sizes)), key=lambda index: sizes[index][1], reverse=True)
+    positions = [None] * len(sizes)
+    x = y = shelf_height = sheet_width = 0
+
+    for index in order:
+        width, height = sizes[index]
+        if x and x + width > max_width:
+            # Start a new shelf under the current one
+            y += shelf_height + PADDING
+            x = shelf_height = 0
+        positions[index] = (x, y)
+        x += width + PADDING
+        shelf_height = max(shelf_height, height)
+        sheet_width = max(sheet_width, x - PADDING)
+
+    return positions, (sheet_width, y + shelf_height)
+
+
+def build_atlas(index_path, max_width):
+    """Pack the images, save the sheet and write its index."""
+    paths = collect_images()
+    images = [pygame.image.load(path) for path in paths]
+    positions, sheet_size = pack([image.get_size() for image in images], max_width)
+
+    sheet = pygame.Surface(sheet_size, pygame.SRCALPHA)
+    frames = {}
+    for path, image, position in zip(paths, images, positions):
+        sheet.blit(image, position)
+        frames[path] = [*position, *image.get_size()]
+
+    sheet_path = index_path.with_suffix('.png')
+    pygame.image.save(sheet, str(sheet_path))
+    index = {'sheet': sheet_path.as_posix(), 'frames': frames}
+    index_path.write_text(json.dumps(index, indent=2))
+    print(f"Packed {len(frames)} images into {sheet_path} ({sheet_size[0]}x{sheet_size[1]})")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pack the game's sprites into an atlas.")
+    parser.add_argument('--index', type=Path, default=Path(ATLAS_INDEX),
+                        help="where to write the index, the sheet is saved next to it")
+    parser.add_argument('--max-width', type=int, default=512, help="maximum width of the sheet")
+    args = parser.parse_args()
+
+    build_atlas(args.index, args.max_width)
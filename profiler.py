@@ -0,0 +1,114 @@
+import csv
+from collections import deque
+from time import perf_counter_ns
+
+# Phases of a frame, in the order the game runs them
+PHASES = ('events', 'update_position', 'update_rotation',
+          'update_bullets', 'update_aliens', 'update_screen')
+
+
+class _PhaseTimer:
+    """Time one phase of the frame when used as a context manager."""
+
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+
+    def __exit__(self, *exc_info):
+        # Added up, since a frame can run several simulation steps
+        self.timings[self.name] += perf_counter_ns() - self.start
+
+
+class FrameProfiler:
+    """Time each phase of every frame and report rolling percentiles."""
+
+    def __init__(self, ai_game, window=600, refresh_frames=30):
+        """Initialize the profiler, keeping the last `window` frames."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.pacer = ai_game.pacer
+
+        # Nanoseconds spent in each phase of the current frame
+        self.timings = dict.fromkeys(PHASES, 0)
+        self.timers = {name: _PhaseTimer(self.timings, name) for name in PHASES}
+        self.history = {name: deque(maxlen=window) for name in PHASES + ('frame',)}
+        self.frame_start = perf_counter_ns()
+        self.frame = 0
+
+        # Overlay drawn at the top left, refreshed every few frames
+        self.text_color = (50, 205, 50)
+        self.font = ai_game.fonts.get(None, 24)
+        self.refresh_frames = refresh_frames
+        self.overlay_images = []
+
+        self.trace_file = None
+        self.trace_writer = None
+
+    def phase(self, name):
+        """Return a context manager that times a phase of the frame."""
+        return self.timers[name]
+
+    def end_frame(self, scene=''):
+        """Record the timings of the frame that just finished in a scene."""
+        now = perf_counter_ns()
+        frame_time = now - self.frame_start
+        self.frame_start = now
+
+        for name, elapsed in self.timings.items():
+            self.history[name].append(elapsed)
+            self.timings[name] = 0
+        self.history['frame'].append(frame_time)
+
+        if self.trace_writer:
+            self.trace_writer.writerow(
+                [self.frame, scene, frame_time] + [self.history[name][-1] for name in PHASES])
+
+        self.frame += 1
+        if self.settings.show_profiler and self.frame % self.refresh_frames == 0:
+            self._prep_overlay()
+
+    def percentiles(self, name):
+        """Return the p50, p95 and p99 of a phase in milliseconds."""
+        samples = sorted(self.history[name])
+        if not samples:
+            return 0.0, 0.0, 0.0
+        last = len(samples) - 1
+        return tuple(samples[round(last * p)] / 1e6 for p in (0.50, 0.95, 0.99))
+
+    def start_trace(self, path):
+        """Write the timings of every following frame to a CSV file."""
+        self.trace_file = open(path, 'w', newline='')
+        self.trace_writer = csv.writer(self.trace_file)
+        self.trace_writer.writerow(['frame', 'scene', 'frame_ns'] + [f"{name}_ns" for name in PHASES])
+
+    def stop_trace(self):
+        """Close the trace file, if there is one."""
+        if self.trace_file:
+            self.trace_file.close()
+            self.trace_file = None
+            self.trace_writer = None
+
+    def _prep_overlay(self):
+        """Turn the current percentiles into rendered images."""
+        lines = ["phase  p50 / p95 / p99 ms"]
+        for name in ('frame',) + PHASES:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name}  {p50:.2f} / {p95:.2f} / {p99:.2f}")
+        lines.append(self.pacer.report())
+        self.overlay_images = [self.font.render(line, True, self.text_color, self.settings.bg_color)
+                               for line in lines]
+
+    def show_overlay(self):
+        """Draw the percentiles to the screen, return the rects drawn."""
+        rects = []
+        y = 20
+        for image in self.overlay_images:
+            rects.append(self.screen.blit(image, (20, y)))
+            y += image.get_height()
+        return rects
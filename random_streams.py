@@ -0,0 +1,19 @@
+import random
+
+
+class RandomStreams:
+    """Seedable random number streams, one for each part of the game.
+
+    Every stream is a `random.Random` seeded from a single master seed, so a
+    game with the same seed replays exactly, and drawing more numbers in one
+    subsystem (e.g. more alien shots) does not shift the others.
+    """
+
+    SUBSYSTEMS = ('spawns', 'shooting', 'upgrades', 'fleets')
+
+    def __init__(self, seed=None):
+        """Initialize the streams, from system randomness if seed is None."""
+        self.seed = seed
+        master = random.Random(seed)
+        for name in self.SUBSYSTEMS:
+            setattr(self, name, random.Random(master.getrandbits(64)))
@@ -0,0 +1,57 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Redraw only the parts of the screen that changed since the last frame.
+
+    Every frame first restores the background under whatever was drawn on the
+    previous frame, then the game draws as usual and hands over the rects it
+    touched. Only the old and new rects are pushed to the display, instead of
+    blitting the whole background and flipping the full screen. Crowded
+    frames with more than `max_rects` rects fall back to a full redraw, which
+    is cheaper than restoring thousands of small pieces.
+    """
+
+    def __init__(self, screen, update_display=True, max_rects=300):
+        """Initialize the renderer for a screen."""
+        self.screen = screen
+        self.update_display = update_display
+        self.max_rects = max_rects
+        self.previous_rects = []
+        self.current_rects = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Redraw the whole screen on the next frame."""
+        self.full_redraw = True
+
+    def begin_frame(self, background):
+        """Erase the previous frame by restoring the background under it."""
+        if len(self.previous_rects) > self.max_rects:
+            self.full_redraw = True
+
+        if self.full_redraw:
+            self.screen.blit(background, (0, 0))
+        else:
+            for rect in self.previous_rects:
+                self.screen.blit(background, rect, rect)
+
+    def add(self, rect):
+        """Mark a rect of the screen as drawn this frame."""
+        self.current_rects.append(rect)
+
+    def add_all(self, rects):
+        """Mark several rects of the screen as drawn this frame."""
+        self.current_rects.extend(rects)
+
+    def end_frame(self):
+        """Push the changed parts of the screen to the display."""
+        if self.update_display:
+            if self.full_redraw or len(self.current_rects) > self.max_rects:
+                pygame.display.flip()
+            else:
+                pygame.display.update(self.previous_rects + self.current_rects)
+
+        self.previous_rects = self.current_rects
+        self.current_rects = []
+        self.full_redraw = False
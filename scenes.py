@@ -1,20 +1,27 @@
 import pygame
-from images import Images
 
 class Scene:
     """
     Base class for all scenes in the game
 
     Attributes:
-        None
+        name (str): The name the profiler records the scene's frames under
+        frame_rate (int): The most frames per second the scene runs at
+        idle (bool): Whether the scene only changes on events, so the
+            game can sleep until one arrives
 
     Methods:
         __init__: Initializes the scene
         setup: Loads all necessary data
+        resume: Continues after the scene on top of it ended
         handle_events: Handles events for the scene
         update: Runs any necessary logic for the scene
         render: Draws the scene to the screen
     """
+    name = 'scene'
+    frame_rate = 120
+    idle = False
+
     def __init__(self):
         """ Initializes the scene """
         pass
@@ -23,6 +30,10 @@ class Scene:
         """ Loads all necessary data """
         pass
 
+    def resume(self):
+        """ Continues after the scene on top of it ended """
+        pass
+
     def handle_events(self, events):
         """ Handles events for the scene """
         pass
@@ -36,25 +47,81 @@ class Scene:
         pass
 
 
+class SceneManager:
+    """
+    A stack of scenes, only the scene on top is run
+
+    Attributes:
+        scenes (list): The scenes on the stack, the active one last
+    """
+    def __init__(self):
+        """ Initializes an empty stack """
+        self.scenes = []
+
+    @property
+    def active(self):
+        """ The scene on top of the stack """
+        return self.scenes[-1]
+
+    def push(self, scene):
+        """ Pauses the active scene and starts a new one on top of it """
+        scene.setup()
+        self.scenes.append(scene)
+
+    def pop(self):
+        """ Ends the active scene and resumes the one under it """
+        scene = self.scenes.pop()
+        if self.scenes:
+            self.scenes[-1].resume()
+        return scene
+
+    def transition(self, scene):
+        """ Ends every scene on the stack and starts a new one """
+        self.scenes.clear()
+        self.push(scene)
+
+    def handle_events(self, events):
+        """ Handles events for the active scene """
+        self.active.handle_events(events)
+
+    def update(self, dt):
+        """ Runs the logic of the active scene only """
+        self.active.update(dt)
+
+    def render(self, screen):
+        """ Draws the active scene to the screen """
+        self.active.render(screen)
+
+
 class MenuScene(Scene):
     """
-    The main menu scene of the game
+    The main menu scene of the game, it barely changes so it runs slowly
 
     Attributes:
-        None
+        ai_game (AlienInvasion): The game the menu starts
     """
-    def __init__(self, settings):
+    name = 'menu'
+    idle = True
+
+    def __init__(self, ai_game):
         """ Initializes the menu scene """
         super().__init__()
-        self.settings = settings
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.image_retrieve = ai_game.image_retrieve
+        self.frame_rate = self.settings.menu_frame_rate
 
     def setup(self):
         """ Loads all necessary data """
-        pass
+        self.ai_game.renderer.invalidate()
+
+    def resume(self):
+        """ Redraws everything after the scene on top of it ended """
+        self.ai_game.renderer.invalidate()
 
     def handle_events(self, events):
         """ Handles events for the menu scene """
-        pass
+        self.ai_game._check_events(events)
 
     def update(self, dt):
         """ Runs any necessary logic for the menu scene """
@@ -62,15 +129,108 @@ class MenuScene(Scene):
     
     def render(self, screen):
         """ Draws the menu scene to the screen """
-        self._draw_menu_gradient(screen, (0, 0, 0), (25, 25, 112)) 
+        renderer = self.ai_game.renderer
+        renderer.begin_frame(self._menu_gradient(screen, (0, 0, 0), (25, 25, 112)))
+
+        renderer.add_all(self.ai_game.score.show_score())
+        for button in self.ai_game.buttons:
+            renderer.add(button.draw_button())
+        if self.settings.show_profiler:
+            renderer.add_all(self.ai_game.profiler.show_overlay())
+
+        renderer.end_frame()
+
+    def _menu_gradient(self, screen, start_color, end_color):
+        """Return a vertical gradient background, rendered once per resolution."""
+        return self.image_retrieve.gradient(
+            screen.get_size(), start_color, end_color)
+
+
+class GameScene(Scene):
+    """
+    The scene the game is played in
+
+    Attributes:
+        ai_game (AlienInvasion): The game being played
+    """
+    name = 'game'
+
+    def __init__(self, ai_game):
+        """ Initializes the game scene """
+        super().__init__()
+        self.ai_game = ai_game
+        self.frame_rate = ai_game.pacer.refresh_rate
+
+    def setup(self):
+        """ Loads all necessary data """
+        self.ai_game.renderer.invalidate()
+        self.ai_game.timestep.reset()
+
+    def resume(self):
+        """ Redraws everything after the pause scene ended """
+        self.ai_game.renderer.invalidate()
+        self.ai_game.timestep.reset()
+
+    def handle_events(self, events):
+        """ Handles events for the game scene """
+        self.ai_game._check_events(events)
+
+    def update(self, dt):
+        """ Runs one step of the game """
+        self.ai_game._update_game(dt)
+
+    def render(self, screen):
+        """ Draws the game scene to the screen """
+        self.ai_game._update_screen()
+
+
+class PauseScene(Scene):
+    """
+    Pauses the game scene under it, which stays on the screen as it was
+
+    Attributes:
+        ai_game (AlienInvasion): The game that is paused
+    """
+    name = 'pause'
+    idle = True
+
+    def __init__(self, ai_game):
+        """ Initializes the pause scene """
+        super().__init__()
+        self.ai_game = ai_game
+        self.frame_rate = ai_game.settings.pause_frame_rate
+        self.text_color = (255, 255, 255)
+        self.msg_image = ai_game.fonts.get(None, 48).render(
+            "PAUSED", True, self.text_color, ai_game.settings.bg_color)
+        self.drawn = False
+
+    def setup(self):
+        """ Loads all necessary data """
+        self.drawn = False
 
-    def _draw_menu_gradient(self, screen, start_color, end_color):
-        """Draw a vertical gradient background."""
-        for y in range(self.settings.screen_height):
-            r = start_color[0] + (end_color[0] - start_color[0]) * y // self.settings.screen_height
-            g = start_color[1] + (end_color[1] - start_color[1]) * y // self.settings.screen_height
-            b = start_color[2] + (end_color[2] - start_color[2]) * y // self.settings.screen_height
-            pygame.draw.line(screen, (r, g, b), (0, y), (self.settings.screen_width, y))
+    def handle_events(self, events):
+        """ Resumes the game with Escape or P """
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.ai_game._close_game()
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_ESCAPE, pygame.K_p):
+                    self.ai_game.scenes.pop()
+                    return
+                if event.key == pygame.K_q:
+                    self.ai_game._close_game()
+            elif event.type == pygame.KEYUP:
+                # Keys let go of while paused must not stay held down
+                self.ai_game._check_keyup_events(event)
+
+    def render(self, screen):
+        """ Draws the message once, over the last frame of the game """
+        if self.drawn:
+            return
+        rect = screen.blit(self.msg_image, self.msg_image.get_rect(center=screen.get_rect().center))
+        if not self.ai_game.headless:
+            pygame.display.update(rect)
+        self.drawn = True
 
 
 class Inventory(Scene):
@@ -108,11 +268,11 @@ class BossScene(Scene):
     Attributes:
         boss (pygame.Surface): The boss image
     """
-    def __init__(self):
+    def __init__(self, image_retrieve):
         """ Initializes the boss scene """
         super().__init__()
         self.boss = None
-        self.image_retrieve = Images()
+        self.image_retrieve = image_retrieve
         
     def setup(self):
         """ Loads all necessary data """
@@ -137,15 +297,17 @@ class BasicScene(Scene):
     Attributes:
         background (pygame.Surface): The background image
     """
-    def __init__(self):
+    def __init__(self, settings, image_retrieve):
         """ Initializes the basic scene """
         super().__init__()
         self.background = None
-        self.image_retrieve = Images()
+        self.settings = settings
+        self.image_retrieve = image_retrieve
 
     def setup(self):
         """ Loads all necessary data """
-        self.background = self.image_retrieve.backgrounds['first_background']
+        self.background = self.image_retrieve.background(
+            'first_background', (self.settings.screen_width, self.settings.screen_height))
 
     def handle_events(self, events):
         """ Handles events for the basic scene """
@@ -157,4 +319,34 @@ class BasicScene(Scene):
     
     def render(self, screen):
         """ Draws the basic scene to the screen """
-        screen.blit(self.background, (0, 0))  # Draw the background image
\ No newline at end of file
+        screen.blit(self.background, (0, 0))  # Draw the background image
+
+
+class LoadingScene(Scene):
+    """
+    The loading screen, shown while the assets load in the background
+
+    Attributes:
+        asset_loader (AssetLoader): The loader whose progress is shown
+    """
+    def __init__(self, settings, asset_loader):
+        """ Initializes the loading scene """
+        super().__init__()
+        self.settings = settings
+        self.asset_loader = asset_loader
+        self.bar_color = (50, 205, 50)
+
+    def update(self, dt):
+        """ Converts the assets decoded since the last frame """
+        self.asset_loader.poll(timeout=1 / 60)  # Wait at most a frame at 60 FPS
+
+    def render(self, screen):
+        """ Draws a progress bar in the middle of the screen """
+        screen.fill(self.settings.bg_color)
+        outline = pygame.Rect(0, 0, self.settings.screen_width // 3, 30)
+        outline.center = screen.get_rect().center
+        pygame.draw.rect(screen, self.bar_color, outline, 2)
+
+        bar = outline.inflate(-8, -8)
+        bar.width = int(bar.width * self.asset_loader.progress)
+        screen.fill(self.bar_color, bar)
@@ -0,0 +1,43 @@
+import heapq
+from itertools import count
+
+
+class Scheduler:
+    """Call functions once the game time reaches the time they are due.
+
+    Timers are kept in a min-heap ordered by due time, so each step only
+    looks at the timers that are due instead of polling every one of them.
+    Timers due at the same time are called in the order they were added.
+    """
+
+    def __init__(self):
+        """Initialize the scheduler with no timers, at game time 0."""
+        self.time = 0
+        self.timers = []
+        self.order = count()
+
+    def call_later(self, delay, callback, *args):
+        """Call `callback(*args)` once `delay` milliseconds of game time passed, return the timer."""
+        timer = [self.time + delay, next(self.order), callback, args]
+        heapq.heappush(self.timers, timer)
+        return timer
+
+    def cancel(self, timer):
+        """Stop a timer from being called, it is dropped once it is due."""
+        timer[2] = None
+
+    def advance(self, time):
+        """Move the game time forward and call every timer that is due by then."""
+        timers = self.timers
+        while timers and timers[0][0] <= time:
+            due, _, callback, args = heapq.heappop(timers)
+            if callback is not None:
+                # Timers added by the callback count from when it was due
+                self.time = due
+                callback(*args)
+        self.time = time
+
+    def clear(self, time=0):
+        """Drop every timer and restart at the given game time."""
+        self.timers.clear()
+        self.time = time
@@ -1,5 +1,4 @@
-import pygame.font
-import csv
+from text import CachedText
 
 class Scoreboard:
     """A class to report scoring information."""
@@ -13,7 +12,9 @@ class Scoreboard:
 
         # Font settings for scoring information
         self.text_color = (50, 205, 50)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.fonts.get(None, 48)
+        self.score_text = CachedText(self.font, self.text_color, self.settings.bg_color)
+        self.high_score_text = CachedText(self.font, self.text_color, self.settings.bg_color)
 
         # Prepare the initial score image
         self.prep_score()
@@ -23,8 +24,7 @@ class Scoreboard:
         """Turn the score into a rendered image."""
         rounded_score = round(self.stats.score, -1)
         score_str = f"{rounded_score:,}"
-        self.score_image = self.font.render(score_str, 
-            True, self.text_color, self.settings.bg_color)
+        self.score_image = self.score_text.render(score_str)
         
         # Display the score at the top right of the screen
         self.score_rect = self.score_image.get_rect()
@@ -35,8 +35,7 @@ class Scoreboard:
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = f"{high_score:,}"
-        self.high_score_image = self.font.render(high_score_str, 
-            True, self.text_color, self.settings.bg_color)
+        self.high_score_image = self.high_score_text.render(high_score_str)
         
         # Display the score at the top right of the screen
         self.high_score_rect = self.high_score_image.get_rect()
@@ -51,6 +50,6 @@ class Scoreboard:
 
 
     def show_score(self):
-        """Draw the score to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
\ No newline at end of file
+        """Draw the score to the screen, return the rects drawn."""
+        return [self.screen.blit(self.score_image, self.score_rect),
+                self.screen.blit(self.high_score_image, self.high_score_rect)]
\ No newline at end of file
@@ -1,6 +1,3 @@
-import pygame
-
-
 class Settings:
     """A class to store all the settings of the game characters"""
 
@@ -10,20 +7,58 @@ class Settings:
         # Screen settings
         self.screen_width = 1920
         self.screen_height = 1080
+
+        # Size of the grid cells used to find collisions, 16 x 9 cells at 1080p
+        self.collision_cell_size = self.screen_width // 16
         
         self.bg_color = (0,0,0)
 
-        self.bg_image = pygame.image.load('images/first_background_resize.jpg')
+        # Slice sprites out of the atlas built by pack_atlas.py, if there is one
+        self.use_sprite_atlas = True
+
+        # Load images and sounds from the bundle built by asset_bundle.py, if there is one
+        self.use_asset_bundle = True
+
+        # Only redraw the parts of the screen that changed each frame
+        self.dirty_rect_rendering = True
+
+        # Only count hits where the opaque pixels of sprites overlap, not just their rects
+        self.mask_collisions = True
+
+        # Show the frame time overlay, toggled with F3
+        self.show_profiler = False
+
+        # Frames per second while playing if the display refresh rate is
+        # unknown, and at most on the menu, while paused and while minimized
+        self.frame_rate = 120
+        self.menu_frame_rate = 30
+        self.pause_frame_rate = 15
+        self.minimized_frame_rate = 1
+
+        # Simulation steps per second, however often the screen is redrawn
+        self.tick_rate = 120
+        self.fixed_delta_time = 1000 / self.tick_rate / 100
+        self.max_steps_per_frame = 5  # Slower frames drop the time left over
 
         # Ship settings
         self.ship_limit = 3
         self.ship_acceleration = 10.0
         self.ship_friction = 0.92
         self.shield_strength = 0  # Default shield strength
+        self.ship_hit_pause = 500  # Milliseconds the game holds still after a hit
+
+        # Bullet settings, how many spare bullets are kept for reuse
+        self.bullet_pool_size = 256
+        self.alien_bullet_pool_size = 1024
+        self.vectorized_bullets = True  # Simulate bullets with NumPy, if installed
 
-        # Alien settings 
-        self.max_aliens = 5
+        # Alien settings, at most max_aliens are alive at once, fleets included
+        self.max_aliens = 64
+        self.max_spawned_aliens = 5  # Aliens that spawned one at a time, alive at once
+        self.recycle_aliens = True  # Send aliens that leave the screen back in, instead of dropping them
         self.alien_spawn_interval = 10000
+        self.boss_fight_delay = 2000  # Milliseconds between reaching a boss level and the boss
+        self.upgrade_lifetime = 15000  # Milliseconds an upgrade waits to be picked up
 
         # Game speeds up
         self.speedup_scale = 1.1
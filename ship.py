@@ -1,6 +1,5 @@
 import math
 import pygame
-from images import Images
 
 class Ship:
     """A class to manage the ship"""
@@ -10,23 +9,23 @@ class Ship:
         self.screen = ai_game.screen
         self.screen_rect = ai_game.screen.get_rect()
         self.settings = ai_game.settings
-        self.image_retrieve = Images()
+        self.image_retrieve = ai_game.image_retrieve
 
         # Load the ship image and get its rect.
         self.original_image = self.image_retrieve.ships['human_ship']
         self.image = self.original_image
         self.rect = self.image.get_rect()
         
-        from movements import MovementSystem
-        self.movement = MovementSystem(self, self.settings)
+        from movements import MovementComponent
+        self.movement = MovementComponent(self, self.settings)
 
-    def blitme(self):
-        """Draw the ship at its current location"""
-        self.screen.blit(self.image, self.rect)
+    def blitme(self, position=None):
+        """Draw the ship at its current location or a given one, return the rect drawn"""
+        return self.screen.blit(self.image, self.rect if position is None else position)
 # TODO: se one update func
-    def update_rotation(self):
-        """Update the ship's rotation."""
-        self.movement.update_rotation()
+    def update_rotation(self, target_pos):
+        """Update the ship's rotation to face the target position."""
+        self.movement.update_rotation(target_pos)
 
     def update_position(self, delta_time):
         """Update the ship's position."""
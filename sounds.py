@@ -1,42 +1,109 @@
 import pygame
+from pathlib import Path
+
+# Priority of each sound effect, when every channel is busy a new effect
+# steals the channel of the oldest effect with a lower or equal priority
+EFFECT_PRIORITIES = {
+    'enterGameSound': 3,
+    'selectionSound': 3,
+    'damageSound': 2,
+    'laserShoot': 1,
+}
+
+# Effects with a channel of their own, so they are never starved by rapid fire
+RESERVED_EFFECTS = ('damageSound', 'enterGameSound')
 
 class SoundManager:
     """A class to manage all game sounds and music."""
-    
-    def __init__(self):
-        """Initialize the SoundManager."""
+
+    def __init__(self, sounds_dir='sounds', bundle=None):
+        """Initialize the SoundManager, taking the effects from the AssetBundle if given."""
         pygame.mixer.quit()  # Restart the mixer with optimized settings
         pygame.mixer.init(buffer=4096)  # Increase buffer size for smoother playback
         pygame.mixer.set_num_channels(16)  # Allow up to 16 simultaneous sounds
         self.music_channel = pygame.mixer.Channel(0)  # Dedicated channel for music
         self.volume_music = 0.5
         self.volume_effects = 1.0
-        print(f"Active channels: {pygame.mixer.get_busy()}")
-            
+
+        # Decode every sound effect once, so playing one never touches the disk
+        if bundle and bundle.has_sounds():
+            self.effects = bundle.load_sounds()
+        else:
+            self.effects = {path.stem: pygame.mixer.Sound(path)
+                            for path in sorted(Path(sounds_dir).glob('*.wav'))}
+
+        # Keep the music and reserved channels out of the shared pool
+        pygame.mixer.set_reserved(1 + len(RESERVED_EFFECTS))
+        self.reserved_channels = {effect: pygame.mixer.Channel(index + 1)
+                                  for index, effect in enumerate(RESERVED_EFFECTS)}
+        self.effect_channels = [pygame.mixer.Channel(index) for index in
+                                range(1 + len(RESERVED_EFFECTS), pygame.mixer.get_num_channels())]
+        self.channel_priorities = [0] * len(self.effect_channels)
+        self.channel_start_times = [0] * len(self.effect_channels)
+
+        # Effects already played this frame, to skip identical repeats
+        self.played_this_frame = set()
+
     def play_music(self, music_file, loops=-1):
         """Play background music."""
         if not self.music_channel.get_busy():  # Avoid interrupting already playing music
             music = pygame.mixer.Sound(music_file)
             self.music_channel.set_volume(self.volume_music)
             self.music_channel.play(music, loops=loops)
-    
+
     def stop_music(self):
         """Stop the background music."""
         self.music_channel.stop()
 
+    def start_frame(self):
+        """Allow every effect to be played again, called once per frame."""
+        self.played_this_frame.clear()
+
     def play_sound_effect(self, selection):
         """Play a sound effect."""
-        sound = pygame.mixer.Sound(f"sounds/{selection}.wav")
-        available_channel = pygame.mixer.find_channel()
+        if selection in self.played_this_frame:
+            return
+        self.played_this_frame.add(selection)
+
+        sound = self.effects[selection]
+        if selection in self.reserved_channels:
+            available_channel = self.reserved_channels[selection]
+        else:
+            available_channel = self._find_effect_channel(selection)
+
         if available_channel:
             available_channel.set_volume(self.volume_effects)
             available_channel.play(sound)
 
+    def _find_effect_channel(self, selection):
+        """Return a free channel, or steal one playing a less important effect."""
+        priority = EFFECT_PRIORITIES.get(selection, 0)
+        now = pygame.time.get_ticks()
+
+        stolen = None
+        for index, channel in enumerate(self.effect_channels):
+            if not channel.get_busy():
+                stolen = index
+                break
+            if self.channel_priorities[index] > priority:
+                continue
+            # Prefer the lowest priority, then the effect that has played longest
+            if stolen is None or (self.channel_priorities[index], self.channel_start_times[index]) < (
+                    self.channel_priorities[stolen], self.channel_start_times[stolen]):
+                stolen = index
+
+        if stolen is None:
+            return None
+
+        self.channel_priorities[stolen] = priority
+        self.channel_start_times[stolen] = now
+        return self.effect_channels[stolen]
+
     def set_music_volume(self, volume):
         """Set the volume for background music."""
         self.volume_music = max(0.0, min(volume, 1.0))  # Clamp volume between 0.0 and 1.0
         self.music_channel.set_volume(self.volume_music)
-    
+
     def set_effects_volume(self, volume):
         """Set the volume for sound effects."""
         self.volume_effects = max(0.0, min(volume, 1.0))  # Clamp volume between 0.0 and 1.0
@@ -0,0 +1,39 @@
+import pygame.font
+
+
+class Fonts:
+    """Shared fonts, each created once and reused by every piece of text."""
+
+    def __init__(self):
+        """Initialize an empty set of fonts."""
+        self.fonts = {}
+
+    def get(self, name=None, size=48):
+        """Return the system font with the given name and size."""
+        key = (name, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.SysFont(name, size)
+        return self.fonts[key]
+
+
+class CachedText:
+    """A piece of text that is only rendered again when it changes.
+
+    Meant for text like the score, which is asked to update on every hit but
+    often shows the same string as before.
+    """
+
+    def __init__(self, font, color, background=None):
+        """Initialize the text with a font and colors."""
+        self.font = font
+        self.color = color
+        self.background = background
+        self.text = None
+        self.image = None
+
+    def render(self, text):
+        """Return an image of the text, reusing the last one if it is the same."""
+        if text != self.text:
+            self.text = text
+            self.image = self.font.render(text, True, self.color, self.background)
+        return self.image
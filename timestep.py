@@ -0,0 +1,44 @@
+class FixedTimestep:
+    """Split the time of each frame into simulation steps of a fixed length.
+
+    The time of every frame is added to an accumulator, and the simulation
+    runs one step for each whole step that built up. What is left over
+    becomes `alpha`, how far the display is between the last two steps,
+    which is used to interpolate the positions sprites are drawn at.
+    """
+
+    def __init__(self, step, max_steps=5):
+        """Initialize the accumulator for steps of `step` delta time."""
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.discard_next = False
+
+    def reset(self):
+        """Forget the time built up, e.g. when coming back from the menu.
+
+        The time of the next frame is dropped too, it was measured while
+        another scene was waiting and would otherwise run as catch-up steps.
+        """
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.discard_next = True
+
+    def advance(self, delta_time):
+        """Add the time of a frame and return how many steps to run."""
+        if self.discard_next:
+            self.discard_next = False
+            delta_time = 0.0
+        self.accumulator += delta_time
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            # Drop the time a very slow frame left behind instead of
+            # running ever more steps to catch up with it
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+
+        self.alpha = self.accumulator / self.step
+        return steps